@@ -0,0 +1,458 @@
+"""HTTP/JSON API for the dashboard numbers (ASGI, no Streamlit).
+
+    python api_server.py --port 8800 --workers 4      # needs uvicorn (pip install "uvicorn[standard]")
+    uvicorn api_server:app --port 8800                # or any other ASGI server
+
+    GET /personal                              financial summary, utilization, spending by category
+    GET /risk                                  client ids
+    GET /risk/{user_id}                        risk metrics, warning flags, recommendations, high-risk days
+    GET /portfolio                             client ids
+    GET /portfolio/{user_id}                   headline metrics, sector values, risk mix, advice
+    GET /portfolio/{user_id}/history?start=&end=   daily valuation series (ISO dates, both optional,
+                                               clamped to the client's first and last snapshot)
+    GET /credit/{row}                          profile fields, score, band and insight story
+    GET /trend?start=&end=&categories=a,b&level=Hour&threshold=25000   (threshold >= 10000)
+    GET /health, /metrics (Prometheus: section timings + response cache counters)
+
+Every response body is built once and kept in an in-memory LRU of
+FINTALK_API_CACHE_SIZE entries for FINTALK_API_CACHE_TTL seconds, with its
+ETag and (when worth it) a gzip copy, so a hit costs a dict lookup: no data
+file is touched and If-None-Match gets a 304. Misses are computed in a
+thread pool by the fintalk functions the dashboards use, one computation per
+URL however many requests are waiting on it; the datasets behind them are
+rebuilt only when the data file changes. Keep-alive is the ASGI server's
+(uvicorn keeps HTTP/1.1 connections open for --keep-alive seconds).
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from urllib.parse import parse_qsl
+
+import numpy as np
+import pandas as pd
+
+from data_access import UserIndex, data_version, load_dataset
+from fintalk import credit, personal, portfolio, risk, trend
+from fx_rates import rates_version
+from profiling import section, to_prometheus
+
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is just slower
+    orjson = None
+
+CACHE_SIZE = int(os.environ.get("FINTALK_API_CACHE_SIZE", "4096"))
+CACHE_TTL = float(os.environ.get("FINTALK_API_CACHE_TTL", "30"))
+GZIP_MIN_BYTES = 1024
+COMPUTE_THREADS = int(os.environ.get("FINTALK_API_THREADS", "4"))
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# --------------------------------------
+# Datasets and per-client models, rebuilt when their data version changes
+# --------------------------------------
+_models = {}                # name -> (version, model)
+_build_locks = {}           # name -> lock held while that model is (re)built
+_model_lock = threading.Lock()
+
+
+def _model(name, version, build):
+    with _model_lock:
+        cached = _models.get(name)
+        if cached and cached[0] == version:
+            return cached[1]
+        build_lock = _build_locks.setdefault(name, threading.Lock())
+    # One build per model: concurrent misses on other URLs wait for it instead of building their own
+    with build_lock:
+        with _model_lock:
+            cached = _models.get(name)
+            if cached and cached[0] == version:
+                return cached[1]
+        with section(f"api.build.{name}"):
+            model = build()
+        with _model_lock:
+            _models[name] = (version, model)
+    return model
+
+
+def _risk_model():
+    def build():
+        index = UserIndex(load_dataset("risk"))
+        return index, risk.compute_risk_metrics(index.frame)
+    return _model("risk", data_version("risk"), build)
+
+
+def _portfolio_model():
+    def build():
+        holdings = portfolio.to_inr(load_dataset("portfolio"))
+        return portfolio.PortfolioMetrics(holdings), portfolio.PortfolioHistory(holdings)
+    return _model("portfolio", (data_version("portfolio"), rates_version()), build)
+
+
+def _credit_model():
+    return _model("credit", data_version("credit"), lambda: load_dataset("credit"))
+
+
+def _personal_model():
+    return _model("personal", data_version("personal"), lambda: load_dataset("personal"))
+
+
+_feed = None
+_feed_lock = threading.Lock()
+
+
+def _trend_snapshot():
+    """The shared transaction feed's snapshot; each call first folds in rows appended since the last one."""
+    global _feed
+    with _feed_lock:
+        if _feed is None:
+            _feed = trend.TrendFeed()
+        _feed.refresh()
+        return _feed.snapshot()
+
+
+# --------------------------------------
+# Endpoints: (path params, query) -> JSON-able payload
+# --------------------------------------
+def _date_param(query, name):
+    value = query.get(name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise HTTPError(400, f"{name} must be an ISO date (YYYY-MM-DD)")
+
+
+def _number_param(query, name, default):
+    try:
+        return float(query.get(name, default))
+    except ValueError:
+        raise HTTPError(400, f"{name} must be a number")
+
+
+def get_health(params, query):
+    return {"status": "ok"}
+
+
+def get_personal(params, query):
+    df = _personal_model()
+    return {
+        "summary": personal.financial_summary(df),
+        "credit_utilization": personal.credit_utilization(df),
+        "spending_by_category": personal.spending_by_category(df),
+        "records": len(df),
+    }
+
+
+def get_risk_users(params, query):
+    index, _ = _risk_model()
+    return {"user_ids": index.user_ids}
+
+
+def get_risk(params, query):
+    index, metrics = _risk_model()
+    user_id = int(params["user_id"])
+    if user_id not in index:
+        raise HTTPError(404, f"no risk data for user {user_id}")
+    row = metrics.loc[user_id]
+    rows = index.rows(user_id)
+    return {
+        "user_id": user_id,
+        "metrics": row.drop("recommendations"),
+        "flags": risk.risk_flags(row),
+        "recommendations": row["recommendations"],
+        "high_risk_days": risk.high_risk_days(rows).rename(columns={"date_only": "date", "Suspicious Txns": "count"}),
+    }
+
+
+def get_portfolio_users(params, query):
+    metrics, _ = _portfolio_model()
+    return {"user_ids": metrics.summary.index}
+
+
+def get_portfolio(params, query):
+    metrics, _ = _portfolio_model()
+    user_id = int(params["user_id"])
+    if user_id not in metrics.summary.index:
+        raise HTTPError(404, f"no holdings for user {user_id}")
+    overview = portfolio.client_overview(metrics, user_id)
+    return dict(user_id=user_id, **overview, advice=portfolio.strategic_advice(overview["summary"]))
+
+
+def get_portfolio_history(params, query):
+    _, history = _portfolio_model()
+    user_id = int(params["user_id"])
+    first, last = history.date_bounds(user_id)
+    if first is None:
+        raise HTTPError(404, f"no holdings for user {user_id}")
+    start, end = _date_param(query, "start") or first, _date_param(query, "end") or last
+    if start > end:
+        raise HTTPError(400, "start is after end")
+    # Only the client's own date range: an open-ended span would build (and cache) a huge body
+    start, end = max(start, first), min(end, last)
+    if start > end:
+        raise HTTPError(404, f"user {user_id} has no holdings between those dates")
+    series = history.series(user_id, start, end)
+    return {"user_id": user_id, "start": start, "end": end, "series": series.assign(date=series["date"].dt.date)}
+
+
+def get_credit(params, query):
+    df = _credit_model()
+    row = int(params["row"])
+    if row >= len(df):
+        raise HTTPError(404, f"no credit profile at row {row} ({len(df)} rows)")
+    return dict(row=row, **credit.credit_profile(df, row))
+
+
+def get_trend(params, query):
+    snapshot = _trend_snapshot()
+    level = query.get("level", "Hour")
+    if level not in ("Hour", "Minute"):
+        raise HTTPError(400, "level must be Hour or Minute")
+    categories = query["categories"].split(",") if query.get("categories") else None
+    start, end = _date_param(query, "start"), _date_param(query, "end")
+    threshold = _number_param(query, "threshold", trend.OUTLIER_THRESHOLD)
+    if threshold < trend.CANDIDATE_MIN_AMOUNT:
+        raise HTTPError(400, f"threshold must be at least {trend.CANDIDATE_MIN_AMOUNT}")
+
+    cells = snapshot.view(start, end, categories)
+    rows = trend.filter_transactions(snapshot.candidates, start, end, categories)
+    first, last = snapshot.date_bounds()
+    return {
+        "start": start or first,
+        "end": end or last,
+        "categories": categories or snapshot.categories,
+        **trend.trend_summary(cells),
+        "anomalies": len(trend.amount_outliers(rows, threshold)),
+        "stat_anomalies": len(trend.stat_outliers(rows)),
+        "bucket_totals": trend.bucket_totals(cells, level).reset_index(),
+    }
+
+
+ROUTES = [(re.compile(pattern), handler) for pattern, handler in [
+    (r"^/health$", get_health),
+    (r"^/personal$", get_personal),
+    (r"^/risk$", get_risk_users),
+    (r"^/risk/(?P<user_id>\d+)$", get_risk),
+    (r"^/portfolio$", get_portfolio_users),
+    (r"^/portfolio/(?P<user_id>\d+)$", get_portfolio),
+    (r"^/portfolio/(?P<user_id>\d+)/history$", get_portfolio_history),
+    (r"^/credit/(?P<row>\d+)$", get_credit),
+    (r"^/trend$", get_trend),
+]]
+
+
+# --------------------------------------
+# JSON encoding (numpy / pandas values included)
+# --------------------------------------
+def plain(value):
+    """value with frames, series, arrays, numpy scalars and dates turned into JSON types (NaN -> null)."""
+    if isinstance(value, dict):
+        return {str(k): plain(v) for k, v in value.items()}
+    if isinstance(value, pd.DataFrame):
+        return [plain(r) for r in value.to_dict("records")]
+    if isinstance(value, (pd.Series, pd.Index, np.ndarray, list, tuple)):
+        if isinstance(value, pd.Series) and not isinstance(value.index, pd.RangeIndex):
+            return plain(value.to_dict())
+        return [plain(v) for v in (value.tolist() if hasattr(value, "tolist") else value)]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or value is pd.NaT:
+        return None
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, (pd.Timestamp, datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def encode(payload):
+    data = plain(payload)
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# --------------------------------------
+# Response cache: TTL + LRU of ready-to-send bodies
+# --------------------------------------
+class Response:
+    __slots__ = ("status", "body", "gzipped", "etag", "expires")
+
+    def __init__(self, status, body, ttl):
+        self.status = status
+        self.body = body
+        self.gzipped = gzip.compress(body, 6) if len(body) >= GZIP_MIN_BYTES else None
+        self.etag = '"%s"' % hashlib.blake2b(body, digest_size=12).hexdigest()
+        self.expires = time.monotonic() + ttl
+
+
+class ResponseCache:
+    def __init__(self, size=CACHE_SIZE, ttl=CACHE_TTL):
+        self.size, self.ttl = size, ttl
+        self.entries = OrderedDict()
+        self.counts = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0, "not_modified": 0}
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires < time.monotonic():
+            del self.entries[key]
+            self.counts["expired"] += 1
+            return None
+        self.entries.move_to_end(key)
+        self.counts["hits"] += 1
+        return entry
+
+    def put(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+            self.counts["evicted"] += 1
+
+    def clear(self):
+        self.entries.clear()
+
+
+cache = ResponseCache()
+_inflight = {}            # cache key -> Future of the Response being computed
+_executor = ThreadPoolExecutor(max_workers=COMPUTE_THREADS, thread_name_prefix="fintalk-api")
+
+
+def _route(path):
+    for pattern, handler in ROUTES:
+        m = pattern.match(path)
+        if m:
+            return handler, m.groupdict()
+    raise HTTPError(404, f"no such endpoint: {path}")
+
+
+def _compute(path, query):
+    """The Response for a URL (errors included, so bad URLs are cached too)."""
+    try:
+        handler, params = _route(path)
+        with section(f"api.{handler.__name__}"):
+            return Response(200, encode(handler(params, query)), cache.ttl)
+    except HTTPError as e:
+        return Response(e.status, encode({"error": str(e)}), cache.ttl)
+
+
+def _store(key, future):
+    _inflight.pop(key, None)
+    if not future.cancelled() and future.exception() is None:
+        cache.put(key, future.result())
+
+
+async def _response_for(path, query_string):
+    query = dict(parse_qsl(query_string))
+    key = (path, tuple(sorted(query.items())))
+    entry = cache.get(key)
+    if entry is not None:
+        return entry
+    future = _inflight.get(key)
+    if future is None:
+        cache.counts["misses"] += 1
+        future = asyncio.get_running_loop().run_in_executor(_executor, _compute, path, query)
+        _inflight[key] = future
+        future.add_done_callback(lambda f: _store(key, f))
+    # Shielded: a client that disconnects doesn't cancel the computation the others are waiting on
+    return await asyncio.shield(future)
+
+
+def metrics_text():
+    lines = ["# HELP fintalk_api_cache_events_total Response cache events.",
+             "# TYPE fintalk_api_cache_events_total counter"]
+    lines += [f'fintalk_api_cache_events_total{{event="{k}"}} {v}' for k, v in cache.counts.items()]
+    lines += ["# HELP fintalk_api_cache_entries Responses held in the cache.",
+              "# TYPE fintalk_api_cache_entries gauge", f"fintalk_api_cache_entries {len(cache.entries)}"]
+    return to_prometheus() + "\n".join(lines) + "\n"
+
+
+# --------------------------------------
+# ASGI application
+# --------------------------------------
+async def _send(send, status, headers, body, head=False):
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": b"" if head else body})
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            _executor.shutdown(wait=False, cancel_futures=True)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        return await _lifespan(receive, send)
+    if scope["type"] != "http":
+        return
+
+    method = scope["method"]
+    if method not in ("GET", "HEAD"):
+        return await _send(send, 405, [(b"content-type", b"application/json"), (b"allow", b"GET, HEAD")],
+                           b'{"error":"only GET and HEAD are supported"}')
+    head = method == "HEAD"
+
+    if scope["path"] == "/metrics":
+        return await _send(send, 200, [(b"content-type", b"text/plain; version=0.0.4")],
+                           metrics_text().encode(), head)
+
+    entry = await _response_for(scope["path"], scope["query_string"].decode("latin-1"))
+    headers = dict(scope["headers"])
+    common = [(b"etag", entry.etag.encode()), (b"vary", b"Accept-Encoding"),
+              (b"cache-control", b"private, max-age=%d" % cache.ttl)]
+
+    if entry.status == 200 and entry.etag.encode() in headers.get(b"if-none-match", b""):
+        cache.counts["not_modified"] += 1
+        return await _send(send, 304, common, b"", head=True)
+
+    body, out = entry.body, [(b"content-type", b"application/json")] + common
+    if entry.gzipped is not None and b"gzip" in headers.get(b"accept-encoding", b""):
+        body = entry.gzipped
+        out.append((b"content-encoding", b"gzip"))
+    out.append((b"content-length", str(len(body)).encode()))
+    await _send(send, entry.status, out, body, head)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the FinTalk dashboard numbers as JSON")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--workers", type=int, default=1, help="processes (each keeps its own caches)")
+    parser.add_argument("--keep-alive", type=int, default=30, help="seconds an idle connection stays open")
+    args = parser.parse_args(argv)
+
+    try:
+        import uvicorn
+    except ImportError:
+        parser.exit(1, "uvicorn is not installed: pip install \"uvicorn[standard]\" (or run app with any ASGI server)\n")
+    uvicorn.run("api_server:app", host=args.host, port=args.port, workers=args.workers,
+                timeout_keep_alive=args.keep_alive, access_log=False, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
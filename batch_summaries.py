@@ -0,0 +1,60 @@
+"""Headless nightly job: Final Analysis text for every client, written to Parquet.
+
+    python batch_summaries.py --apps risk portfolio --batch-size 16 --out final_analysis.parquet
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from prewarm_summaries import APPS, add_data_args, app_jobs
+from summary_cache import generate_many, summary_key
+
+
+def run_batch(jobs, apps, batch_size, cache_path):
+    frames = []
+    for app in apps:
+        (task, model, params), build = jobs[app]
+        ids, prompts = [], []
+        for item_id, prompt in build():
+            ids.append(item_id)
+            prompts.append(prompt)
+
+        start = time.perf_counter()
+        outputs, generated = generate_many(task, model, prompts, params, batch_size, cache_path)
+        elapsed = time.perf_counter() - start
+        rate = len(prompts) / elapsed if elapsed else float("inf")
+        print(f"{app}: {len(prompts)} items in {elapsed:.1f}s ({rate:.1f} items/sec, {generated} generated)")
+
+        frames.append(pd.DataFrame({
+            "app": app,
+            "user_id": [str(i) for i in ids],
+            "model": model,
+            "prompt_hash": [summary_key(task, model, p, params) for p in prompts],
+            "summary": outputs,
+        }))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--apps", nargs="+", default=["risk", "portfolio"], choices=APPS)
+    parser.add_argument("--out", default="final_analysis.parquet")
+    parser.add_argument("--threads", type=int, default=None, help="torch CPU threads (default: torch's choice)")
+    add_data_args(parser)
+    args = parser.parse_args(argv)
+
+    if args.threads:
+        import torch
+        torch.set_num_threads(args.threads)
+
+    start = time.perf_counter()
+    results = run_batch(app_jobs(args), args.apps, args.batch_size, args.cache)
+    results.to_parquet(args.out, index=False)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {len(results)} rows to {args.out} in {elapsed:.1f}s "
+          f"({len(results) / elapsed if elapsed else 0:.1f} items/sec overall)")
+
+
+if __name__ == "__main__":
+    main()
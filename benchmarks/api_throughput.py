@@ -0,0 +1,109 @@
+"""Request throughput of api_server.
+
+    python benchmarks/api_throughput.py                                  # the ASGI app in-process (no sockets)
+    python benchmarks/api_throughput.py --url http://127.0.0.1:8800 --connections 32 --seconds 10
+
+In-process mode measures the app itself; --url drives a running server over
+keep-alive connections (one thread per connection, gzip accepted). Requests
+cycle through every client's risk and portfolio endpoints plus the credit,
+trend and personal ones, so after the first round they are cache hits. Exits
+non-zero when the rate is below --min-per-second.
+"""
+import argparse
+import asyncio
+import http.client
+import os
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import api_server  # noqa: E402
+
+
+def request_paths():
+    paths = ["/personal", "/trend", "/trend?level=Minute", "/credit/0"]
+    paths += [f"/risk/{uid}" for uid in api_server.get_risk_users({}, {})["user_ids"]]
+    paths += [f"/portfolio/{uid}" for uid in api_server.get_portfolio_users({}, {})["user_ids"]]
+    return paths
+
+
+async def _call(path):
+    path, _, query = path.partition("?")
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": path, "query_string": query.encode(),
+             "headers": [(b"accept-encoding", b"gzip")]}
+    await api_server.app(scope, receive, send)
+    return sent[0]["status"]
+
+
+async def in_process(paths, seconds):
+    for path in paths:  # fill the cache
+        await _call(path)
+    done, deadline = 0, time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        for path in paths:
+            await _call(path)
+        done += len(paths)
+    return done
+
+
+def over_http(url, paths, seconds, connections):
+    parts = urlsplit(url)
+    counts, errors = [0] * connections, []
+    deadline = time.perf_counter() + seconds
+
+    def worker(slot):
+        conn = http.client.HTTPConnection(parts.hostname, parts.port or 80)
+        i = slot
+        while time.perf_counter() < deadline:
+            conn.request("GET", paths[i % len(paths)], headers={"Accept-Encoding": "gzip"})
+            response = conn.getresponse()
+            response.read()
+            if response.status >= 500:
+                errors.append(response.status)
+            counts[slot] += 1
+            i += 1
+        conn.close()
+
+    threads = [threading.Thread(target=worker, args=(slot,)) for slot in range(connections)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if errors:
+        print(f"{len(errors)} server errors")
+    return sum(counts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="base URL of a running server (default: call the app in-process)")
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--min-per-second", type=float, default=2000)
+    args = parser.parse_args(argv)
+
+    paths = request_paths()
+    start = time.perf_counter()
+    if args.url:
+        done = over_http(args.url.rstrip("/"), paths, args.seconds, args.connections)
+    else:
+        done = asyncio.run(in_process(paths, args.seconds))
+    rate = done / (time.perf_counter() - start)
+    print(f"{done} requests over {len(paths)} URLs: {rate:,.0f} requests/sec "
+          f"({'in-process' if not args.url else f'{args.connections} connections'}); cache {api_server.cache.counts}")
+    return 0 if rate >= args.min_per_second else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""Throughput benchmark for credit_model.score_batch.
+
+    python benchmarks/credit_scoring.py --rows 10000000 --min-per-second 10000000
+
+Exits non-zero when the measured rate is below --min-per-second.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credit_model import MAX_SCORE, MIN_SCORE, score_batch  # noqa: E402
+
+
+def synthetic_features(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.uniform(0, 100, rows),
+        rng.integers(0, 8, rows),
+        rng.integers(1, 360, rows),
+        rng.integers(1, 5, rows),
+        rng.integers(0, 8, rows),
+        rng.uniform(40, 100, rows),
+    ]).astype(float)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--min-per-second", type=float, default=10_000_000)
+    args = parser.parse_args(argv)
+
+    features = synthetic_features(args.rows)
+    best = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        scores = score_batch(features)
+        best = min(best, time.perf_counter() - start)
+
+    assert scores.min() >= MIN_SCORE and scores.max() <= MAX_SCORE
+    rate = args.rows / best
+    print(f"{args.rows} rows in {best:.3f}s: {rate:,.0f} scores/sec; "
+          f"mean {scores.mean():.0f}, p5 {np.percentile(scores, 5):.0f}, p95 {np.percentile(scores, 95):.0f}")
+    return 0 if rate >= args.min_per_second else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
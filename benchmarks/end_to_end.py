@@ -0,0 +1,223 @@
+"""End-to-end benchmark of each app's compute path on synthetic data of growing size.
+
+    python benchmarks/end_to_end.py --sizes 10000 100000 1000000 --out e2e.json
+    python benchmarks/end_to_end.py --sizes 10000000 --data-dir /scratch/fintalk   # keep (and reuse) the files
+
+For every size the five datasets are written with synthetic_data (size rows
+each, clients as in synthetic_data.ROWS_PER_USER), then every step below runs
+headless: loading, the per-client aggregations and risk metrics, anomaly
+scoring, PDF reports for --reports clients and credit charts for --charts
+rows. Each step's wall time, CPU time and peak traced memory (tracemalloc,
+through profiling.section) is recorded; the closing table shows every step
+across sizes with its growth exponent (log-log slope, 1.0 = linear).
+Tracing memory slows pure-Python steps down; --no-memory times without it.
+"""
+import argparse
+import gc
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def build_steps(data_dir, reports, charts):
+    """[(step name, fn(ctx))] in run order; later steps read what earlier ones left in ctx."""
+    from anomaly_stream import score_frame
+    from credit_insights import credit_stories
+    from credit_model import credit_features, score_batch
+    from data_access import UserIndex, csv_path, load_dataset
+    from fintalk import personal
+    from fx_rates import load_rates
+    from portfolio_engine import HOLDING_COLUMNS, PortfolioMetrics, to_inr
+    from portfolio_history import PortfolioHistory
+    from report_builder import render_personal_pdf, render_portfolio_pdf, render_risk_pdf
+    from report_format import outlier_lines
+    from risk_engine import compute_risk_metrics, daily_anomaly_counts
+    from synthetic_data import FX_RATES_FILE
+    from trend_cube import balance_curve, bucket_totals, minute_totals
+    from trend_feed import TrendFeed
+
+    def first_clients(ids):
+        return list(ids[:reports])
+
+    def risk_pdfs(ctx):
+        metrics = ctx["risk_metrics"].drop(columns="recommendations")
+        for user_id in first_clients(metrics.index):
+            render_risk_pdf(user_id, metrics.loc[user_id].to_dict(), "Synthetic advisor note.")
+
+    def portfolio_pdfs(ctx):
+        index = UserIndex(ctx["holdings"])
+        for user_id in first_clients(index.user_ids):
+            render_portfolio_pdf(user_id, ctx["portfolio_metrics"].user_summary(user_id),
+                                 index.rows(user_id)[HOLDING_COLUMNS], "Synthetic advisor note.")
+
+    def credit_charts(ctx):
+        from credit_charts import CHARTS, chart_png
+
+        for _, row in ctx["credit"].head(charts).iterrows():
+            for chart in CHARTS:
+                chart_png(chart, row)
+
+    def trend_outliers(ctx):
+        candidates = ctx["feed"].snapshot().candidates
+        outlier_lines(candidates[candidates["amount"].abs() > 25_000].head(20))
+
+    return [
+        ("personal.load", lambda ctx: ctx.update(personal=load_dataset("personal"))),
+        ("personal.summary", lambda ctx: (personal.financial_summary(ctx["personal"]),
+                                          personal.credit_utilization(ctx["personal"]))),
+        ("personal.spending", lambda ctx: personal.spending_by_category(ctx["personal"])),
+        ("personal.groceries_status", lambda ctx: personal.groceries_status(ctx["personal"])),
+        ("personal.pdf_report", lambda ctx: render_personal_pdf(personal.report_text(ctx["personal"]))),
+
+        ("risk.load", lambda ctx: ctx.update(risk=load_dataset("risk"))),
+        ("risk.user_index", lambda ctx: ctx.update(risk_index=UserIndex(ctx["risk"]))),
+        ("risk.metrics", lambda ctx: ctx.update(risk_metrics=compute_risk_metrics(ctx["risk"]))),
+        ("risk.daily_anomalies", lambda ctx: daily_anomaly_counts(ctx["risk"])),
+        ("risk.anomaly_scores", lambda ctx: score_frame(ctx["risk"], "transaction_time",
+                                                        ["user_id", "transaction_category"], "transaction_amount")),
+        ("risk.pdf_reports", risk_pdfs),
+
+        ("trend.feed_load", lambda ctx: ctx.update(feed=TrendFeed(csv_path("trend"))) or ctx["feed"].refresh()),
+        ("trend.bucket_totals", lambda ctx: bucket_totals(ctx["feed"].cube.frame, "Hour")),
+        ("trend.minute_totals", lambda ctx: minute_totals(ctx["feed"].cube.view(), "Expense")),
+        ("trend.balance_curve", lambda ctx: balance_curve(ctx["feed"].snapshot().cells)),
+        ("trend.outliers", trend_outliers),
+
+        ("portfolio.load", lambda ctx: ctx.update(portfolio=load_dataset("portfolio"))),
+        ("portfolio.to_inr", lambda ctx: ctx.update(holdings=to_inr(
+            ctx["portfolio"], rates=load_rates(os.path.join(data_dir, FX_RATES_FILE))))),
+        ("portfolio.metrics", lambda ctx: ctx.update(portfolio_metrics=PortfolioMetrics(ctx["holdings"]))),
+        ("portfolio.history", lambda ctx: ctx.update(history=PortfolioHistory(ctx["holdings"]))),
+        ("portfolio.history_series", lambda ctx: [ctx["history"].series(uid)
+                                                  for uid in first_clients(ctx["history"].user_ids)]),
+        ("portfolio.pdf_reports", portfolio_pdfs),
+
+        ("credit.load", lambda ctx: ctx.update(credit=load_dataset("credit"))),
+        ("credit.score", lambda ctx: score_batch(credit_features(ctx["credit"]))),
+        ("credit.stories", lambda ctx: credit_stories(ctx["credit"])),
+        ("credit.charts", credit_charts),
+    ]
+
+
+def prepare_data(size, data_dir, seed):
+    """Write (or reuse) the synthetic files for size under data_dir and point data_access at them."""
+    from data_access import DATASETS
+    from synthetic_data import FX_RATES_FILE, GENERATORS, write_dataset, write_fx_rates
+
+    os.makedirs(data_dir, exist_ok=True)
+    marker = os.path.join(data_dir, "synthetic.json")
+    spec = {"rows": size, "seed": seed}
+    if not (os.path.exists(marker) and json.load(open(marker)) == spec):
+        start = time.perf_counter()
+        for name in GENERATORS:
+            write_dataset(name, size, data_dir, seed=seed)
+        write_fx_rates(data_dir, seed)
+        with open(marker, "w") as f:
+            json.dump(spec, f)
+        print(f"  generated {size:,} rows per dataset in {time.perf_counter() - start:.1f}s")
+    for name, (file_name, _, _) in DATASETS.items():
+        os.environ[f"FINTALK_{name.upper()}_CSV"] = os.path.join(data_dir, file_name)
+    os.environ["FINTALK_FX_RATES"] = os.path.join(data_dir, FX_RATES_FILE)
+
+
+def run_size(size, data_dir, args):
+    import profiling
+
+    prepare_data(size, data_dir, args.seed)
+    steps = build_steps(data_dir, args.reports, args.charts)
+    profiling.clear()
+    ctx, results = {}, []
+    for name, fn in steps:
+        if args.only and name.split(".")[0] not in args.only:
+            continue
+        gc.collect()
+        status = "ok"
+        try:
+            with profiling.section(name):
+                fn(ctx)
+        except ImportError as e:
+            status = f"skipped ({e})"
+        record = [r for r in profiling.records() if r["section"] == name][-1]
+        results.append({
+            "size": size, "step": name, "status": status,
+            "wall_s": record["wall_s"], "cpu_s": record["cpu_s"],
+            "peak_mib": None if record["peak_bytes"] is None else record["peak_bytes"] / 2 ** 20,
+        })
+        peak = "" if results[-1]["peak_mib"] is None else f"  peak {results[-1]['peak_mib']:8.1f} MiB"
+        print(f"  {name:26s} {record['wall_s']:9.3f}s  cpu {record['cpu_s']:9.3f}s{peak}"
+              f"{'' if status == 'ok' else '  ' + status}")
+    return results
+
+
+def growth(results, step, key):
+    """Log-log slope of key against size between the smallest and largest size that ran the step."""
+    points = [(r["size"], r[key]) for r in results if r["step"] == step and r["status"] == "ok" and r[key]]
+    if len(points) < 2 or points[0][0] == points[-1][0]:
+        return None
+    (n0, v0), (n1, v1) = points[0], points[-1]
+    return math.log(v1 / v0) / math.log(n1 / n0)
+
+
+def print_curves(results, sizes):
+    steps = list(dict.fromkeys(r["step"] for r in results))
+    cell = {(r["step"], r["size"]): r for r in results}
+    print("\nwall seconds / peak MiB by rows per dataset; exponent: 1.0 = linear")
+    print(f"{'step':26s}" + "".join(f"{size:>20,}" for size in sizes) + f"{'time exp':>10s}{'mem exp':>9s}")
+    for step in steps:
+        cols = []
+        for size in sizes:
+            r = cell.get((step, size))
+            if r is None or r["status"] != "ok":
+                cols.append(f"{'-':>20s}")
+            else:
+                mem = "" if r["peak_mib"] is None else f" / {r['peak_mib']:.1f}"
+                cols.append(f"{r['wall_s']:.3f}{mem}".rjust(20))
+        exps = [growth(results, step, key) for key in ("wall_s", "peak_mib")]
+        print(f"{step:26s}" + "".join(cols) + "".join(f"{'-' if e is None else f'{e:.2f}':>{w}s}"
+                                                       for e, w in zip(exps, (10, 9))))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--reports", type=int, default=20, help="clients to render PDF reports for, per report type")
+    parser.add_argument("--charts", type=int, default=20, help="credit rows to render charts for")
+    parser.add_argument("--only", nargs="*", help="apps whose steps to run, e.g. risk credit (default: all)")
+    parser.add_argument("--data-dir", help="keep the generated files here (one folder per size) and reuse them")
+    parser.add_argument("--no-memory", action="store_true", help="don't trace memory (faster, no peaks)")
+    parser.add_argument("--out", help="write every measurement to this JSON file")
+    args = parser.parse_args(argv)
+
+    # Read when the repo modules are first imported; eager imports keep library import time out of the first step
+    os.environ["FINTALK_PROFILE"] = "1"
+    os.environ["FINTALK_EAGER_IMPORTS"] = "1"
+    os.environ["FINTALK_PROFILE_MEMORY"] = "0" if args.no_memory else "1"
+
+    results = []
+    for size in sorted(args.sizes):
+        print(f"{size:,} rows per dataset")
+        root = args.data_dir or tempfile.mkdtemp(prefix="fintalk_bench_")
+        try:
+            results += run_size(size, os.path.join(root, str(size)), args)
+        finally:
+            if not args.data_dir:
+                shutil.rmtree(root, ignore_errors=True)
+
+    print_curves(results, sorted(args.sizes))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"sizes": sorted(args.sizes), "seed": args.seed, "memory_traced": not args.no_memory,
+                       "results": results}, f, indent=2)
+        print(f"\nResults written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+"""Regression benchmark for the vectorized dashboard hot paths.
+
+Runs each path on synthetic inputs (1M rows by default), reports the speedup
+over the old row-wise code on a sample, and exits non-zero when a path is
+slower than its saved baseline by more than --tolerance, when no baseline has
+been saved, or when the batch credit stories / outlier lines differ from the
+per-row ones the pages render:
+
+    python benchmarks/hot_paths.py --save-baseline    # record this machine's timings
+    python benchmarks/hot_paths.py                    # compare against them
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from credit_insights import credit_score_insights, credit_stories  # noqa: E402
+from data_access import csv_path, load_dataset  # noqa: E402
+from report_format import label_value_pairs, outlier_lines, portfolio_detail_lines, transaction_type  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hot_paths_baseline.json")
+
+
+def synthetic_transactions(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    start = np.datetime64("2020-01-01T00:00:00")
+    return pd.DataFrame({
+        "transaction_datetime": start + rng.integers(0, 5 * 365 * 86400, rows).astype("timedelta64[s]"),
+        "merchant": rng.choice(["Groceries Inc.", "Employer Pvt Ltd", "Spotify", "Landlord"], rows),
+        "amount": rng.integers(-50000, 90000, rows),
+        "transaction_category": rng.choice(["Groceries", "Salary", "Rent", "Dining", "SIP"], rows),
+    })
+
+
+def synthetic_holdings(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "asset_type": rng.choice(["bond", "stock", "etf", "mutual_fund"], rows),
+        "asset_name": rng.choice(["Prologis Inc", "iShares Inc", "Vanguard Group"], rows),
+        "ticker": rng.choice(["VOO", "NEE", "AAPL", "MSFT"], rows),
+        "investment_amount": rng.uniform(1000, 50000, rows) * 83.0,
+        "current_value": rng.uniform(1000, 60000, rows) * 83.0,
+        "sector": rng.choice(["Energy", "Finance", "Healthcare", "Technology"], rows),
+        "risk_level": rng.choice(["Low", "Medium", "High"], rows),
+    })
+
+
+def synthetic_credit(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    limit = rng.integers(1000, 50000, rows)
+    return pd.DataFrame({
+        "Total Credit Limit": limit,
+        "Available Credit": (limit * rng.uniform(0, 1, rows)).round(),
+        "Monthly Loan Payment": rng.integers(100, 5000, rows),
+        "Loan Balance": rng.integers(1000, 100000, rows),
+        "Number of Missed Payments": rng.integers(0, 6, rows),
+        "Credit Age (in months)": rng.integers(1, 360, rows),
+        "Number of Credit Types (loan, card)": rng.integers(1, 5, rows),
+        "New Credit Inquiries (last 6 months)": rng.integers(0, 6, rows),
+        "On-Time Payment Percentage": rng.uniform(50, 100, rows).round(2),
+    })
+
+
+# Old row-wise versions, kept only to report the speedup
+def legacy_transaction_type(df):
+    return df["amount"].apply(lambda x: "Income" if x > 0 else "Expense")
+
+
+def legacy_portfolio_lines(df):
+    return [f"{row['asset_type']} | {row['asset_name']} ({row['ticker']}) | Rs.{int(row['investment_amount'])} ➡ "
+            f"Rs.{int(row['current_value'])} | {row['sector']} | {row['risk_level']}" for _, row in df.iterrows()]
+
+
+def legacy_outlier_lines(df):
+    return [f"{row['transaction_datetime']} | {row['merchant']} | Rs.{row['amount']} | {row['transaction_category']}"
+            for _, row in df.iterrows()]
+
+
+def legacy_credit_stories(df):
+    return [credit_score_insights(row) for _, row in df.iterrows()]
+
+
+def legacy_pairs(df):
+    return [(row["sector"], row["current_value"]) for _, row in df.iterrows()]
+
+
+def credit_story_mismatches(df):
+    """Rows where credit_stories differs from credit_score_insights on that row (as the page passes it)."""
+    fast = credit_stories(df)
+    return [i for i in range(len(df)) if credit_score_insights(df.iloc[i]) != fast[i]]
+
+
+def outlier_line_mismatches(df):
+    """Rows where outlier_lines differs from the old f-string loop."""
+    fast, slow = outlier_lines(df), legacy_outlier_lines(df)
+    return [i for i in range(len(df)) if fast[i] != slow[i]]
+
+
+def timed(fn, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(rows, legacy_rows):
+    tx = synthetic_transactions(rows)
+    holdings = synthetic_holdings(rows)
+    credit = synthetic_credit(rows)
+
+    cases = {
+        "transaction_type": (lambda: transaction_type(tx["amount"]), legacy_transaction_type, tx),
+        "portfolio_detail_lines": (lambda: portfolio_detail_lines(holdings), legacy_portfolio_lines, holdings),
+        "outlier_lines": (lambda: outlier_lines(tx), legacy_outlier_lines, tx),
+        "label_value_pairs": (lambda: label_value_pairs(holdings, "sector", "current_value"), legacy_pairs, holdings),
+        "credit_stories": (lambda: credit_stories(credit), legacy_credit_stories, credit),
+    }
+    results = {}
+    for name, (fast, legacy, frame) in cases.items():
+        seconds = timed(fast)
+        sample = frame.head(legacy_rows)
+        legacy_seconds = timed(legacy, sample, repeat=1) * (len(frame) / len(sample))
+        results[name] = seconds
+        print(f"{name:24s} {seconds * 1000:9.1f} ms  (row-wise est. {legacy_seconds:7.2f} s, "
+              f"{legacy_seconds / seconds:6.0f}x)")
+    mismatches = credit_story_mismatches(credit.head(legacy_rows))
+    if os.path.exists(csv_path("credit")):
+        mismatches += credit_story_mismatches(load_dataset("credit"))
+    if mismatches:
+        print(f"MISMATCH: credit_stories differs from credit_score_insights on {len(mismatches)} rows")
+    line_mismatches = outlier_line_mismatches(tx.head(legacy_rows))
+    if os.path.exists(csv_path("trend")):
+        line_mismatches += outlier_line_mismatches(load_dataset("trend"))
+    if line_mismatches:
+        print(f"MISMATCH: outlier_lines differs from the row-wise lines on {len(line_mismatches)} rows")
+    return results, bool(mismatches or line_mismatches)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--legacy-rows", type=int, default=20_000, help="sample size for the row-wise estimate")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed slowdown factor vs baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    results, mismatched = run(args.rows, args.legacy_rows)
+    if mismatched:
+        return 1
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({"rows": args.rows, "seconds": results}, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline first.")
+        return 1
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    scale = args.rows / baseline["rows"]
+    regressions = [
+        name for name, seconds in results.items()
+        if name in baseline["seconds"] and seconds > baseline["seconds"][name] * scale * args.tolerance
+    ]
+    for name in regressions:
+        print(f"REGRESSION: {name} {results[name]:.3f}s vs baseline {baseline['seconds'][name] * scale:.3f}s")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""Render a PDF report for every client in parallel.
+
+    python bulk_reports.py risk --out risk_reports.zip --workers 8
+    python bulk_reports.py portfolio --out reports/portfolio/
+"""
+import argparse
+import os
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from data_access import load_dataset
+from fintalk.portfolio import HOLDING_COLUMNS, PortfolioMetrics, to_inr
+from fintalk.risk import compute_risk_metrics
+from note_store import get_store
+from report_builder import render_portfolio_pdf, render_risk_pdf
+
+
+# --------------------------------------
+# Per-client jobs (plain data, so they pickle cheaply to the workers)
+# --------------------------------------
+# note_for(user_id) -> the advisor note to print in that client's report
+def risk_jobs(note_for):
+    metrics = compute_risk_metrics(load_dataset("risk")).drop(columns="recommendations")
+    for user_id, row in zip(metrics.index, metrics.to_dict("records")):
+        yield f"risk_report_user_{user_id}.pdf", (render_risk_pdf, (user_id, row, note_for(user_id)))
+
+
+def portfolio_jobs(note_for):
+    df = to_inr(load_dataset("portfolio"))
+    metrics = PortfolioMetrics(df)
+    for user_id, holdings in df.groupby("user_id", sort=False):
+        note = note_for(user_id) or None  # the portfolio report omits the section when there is no note
+        yield (f"portfolio_report_user_{user_id}.pdf",
+               (render_portfolio_pdf, (user_id, metrics.user_summary(user_id), holdings[HOLDING_COLUMNS], note)))
+
+
+JOBS = {"risk": risk_jobs, "portfolio": portfolio_jobs}
+
+
+def _render(batch):
+    return [(name, build(*args)) for name, (build, args) in batch]
+
+
+def _batches(jobs, size):
+    it = iter(jobs)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+class _DirectoryWriter:
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def write(self, name, data):
+        with open(os.path.join(self.path, name), "wb") as f:
+            f.write(data)
+
+    def close(self):
+        pass
+
+
+class _ZipWriter:
+    def __init__(self, path):
+        # PDFs are already compressed; storing them keeps the writer off the critical path
+        self.zf = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED)
+
+    def write(self, name, data):
+        self.zf.writestr(name, data)
+
+    def close(self):
+        self.zf.close()
+
+
+def export_reports(jobs, out, workers=None, chunksize=16):
+    """Render jobs across a process pool, streaming each PDF to out as it completes.
+
+    Only 2 * workers batches are in flight at a time, so jobs are pulled from the iterable
+    (and finished PDFs written out) as the pool keeps up rather than all up front.
+    """
+    workers = workers or os.cpu_count() or 1
+    writer = _ZipWriter(out) if out.endswith(".zip") else _DirectoryWriter(out)
+    count = total_bytes = 0
+    start = time.perf_counter()
+
+    def drain(future):
+        nonlocal count, total_bytes
+        for name, data in future.result():
+            writer.write(name, data)
+            count += 1
+            total_bytes += len(data)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for batch in _batches(jobs, chunksize):
+                pending.append(pool.submit(_render, batch))
+                if len(pending) >= 2 * workers:
+                    drain(pending.popleft())
+            while pending:
+                drain(pending.popleft())
+    finally:
+        writer.close()
+    return count, total_bytes, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("app", choices=sorted(JOBS))
+    parser.add_argument("--out", required=True, help="a .zip archive or a directory")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunksize", type=int, default=16)
+    parser.add_argument("--note-file", help="advisor note to include in every report "
+                                            "(default: each client's note from the note store)")
+    args = parser.parse_args(argv)
+
+    if args.note_file:
+        with open(args.note_file, "r", encoding="utf-8") as f:
+            note = f.read()
+        note_for = lambda user_id: note
+    else:
+        notes = get_store()
+        note_for = lambda user_id: notes.get(args.app, user_id)
+
+    count, total_bytes, elapsed = export_reports(JOBS[args.app](note_for), args.out, args.workers, args.chunksize)
+    print(f"{count} reports ({total_bytes / 1e6:.1f} MB) -> {args.out} in {elapsed:.1f}s "
+          f"({count / elapsed if elapsed else 0:.1f} reports/sec)")
+
+
+if __name__ == "__main__":
+    main()
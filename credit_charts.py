@@ -0,0 +1,112 @@
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+from lazy_imports import lazy
+from profiling import section
+
+plt = lazy("matplotlib.pyplot")  # imported on the first render, not at page load
+
+# ------------------------------------------
+# 🖼️ Credit charts, rendered once and kept as PNG bytes
+# ------------------------------------------
+# Each chart only depends on a couple of fields of the credit row, so the PNG
+# is cached (LRU) under (chart, those values). Figures are closed as soon as
+# they are encoded - pyplot keeps every open figure alive otherwise - and the
+# same bytes feed st.image and the download buttons.
+
+MAX_CHARTS = int(os.environ.get("FINTALK_CHART_CACHE_SIZE", "64"))
+_lock = threading.Lock()          # pyplot is global state; render one figure at a time
+_charts = OrderedDict()           # (chart, input values) -> PNG bytes
+_stats = {"hits": 0, "renders": 0}
+
+
+# ------------------------------------------
+# Chart Utilities
+# ------------------------------------------
+def plot_credit_utilization(row):
+    fig, ax = plt.subplots()
+    used = row['Total Credit Limit'] - row['Available Credit']
+    labels = ['Used Credit', 'Available Credit']
+    sizes = [used, row['Available Credit']]
+    colors = ['#EF553B', '#00CC96']
+    explode = (0.05, 0.05)
+
+    wedges, texts, autotexts = ax.pie(sizes, explode=explode, labels=labels, colors=colors,
+                                      autopct='%1.1f%%', startangle=140, pctdistance=0.85)
+
+    centre_circle = plt.Circle((0, 0), 0.70, fc='white')
+    fig.gca().add_artist(centre_circle)
+    ax.axis('equal')
+    plt.setp(autotexts, size=12, weight="bold", color="white")
+    plt.setp(texts, size=12)
+    fig.patch.set_facecolor('#F9F9F9')
+    ax.set_title("Credit Utilization", fontsize=16, color='#333333')
+    return fig
+
+
+def plot_payment_history_bar(row):
+    months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun']
+    percentage = [max(min(row['On-Time Payment Percentage'] - i * 1.5, 100), 0) for i in range(len(months))][::-1]
+
+    colors = ['#00CC96', '#1FA4A8', '#3C8DAD', '#4C78A8', '#A05195', '#EF553B']
+
+    fig, ax = plt.subplots()
+    bars = ax.bar(months, percentage, color=colors)
+
+    ax.set_title('On-Time Payment History (Last 6 Months)', fontsize=16, color='#333333')
+    ax.set_ylim(0, 100)
+    ax.set_ylabel('% On-Time', fontsize=12)
+    ax.set_facecolor('#F9F9F9')
+    fig.patch.set_facecolor('#F9F9F9')
+
+    for bar in bars:
+        height = bar.get_height()
+        ax.annotate(f'{height:.0f}%',
+                    xy=(bar.get_x() + bar.get_width() / 2, height),
+                    xytext=(0, 5), textcoords="offset points",
+                    ha='center', va='bottom', fontsize=11, weight='bold')
+    return fig
+
+
+# chart name -> (builder, row fields the chart depends on)
+CHARTS = {
+    "credit_utilization": (plot_credit_utilization, ("Total Credit Limit", "Available Credit")),
+    "payment_history": (plot_payment_history_bar, ("On-Time Payment Percentage",)),
+}
+
+
+def fig_to_png(fig):
+    buf = BytesIO()
+    fig.savefig(buf, format="png", bbox_inches="tight")
+    return buf.getvalue()
+
+
+def chart_png(chart, row):
+    """PNG bytes for one of CHARTS drawn from row, rendered at most once per distinct input."""
+    build, fields = CHARTS[chart]
+    key = (chart,) + tuple(float(row[f]) for f in fields)
+    with _lock:
+        if key in _charts:
+            _charts.move_to_end(key)
+            _stats["hits"] += 1
+            return _charts[key]
+
+        with section(f"chart.{chart}"):
+            fig = build({f: v for f, v in zip(fields, key[1:])})
+            try:
+                png = fig_to_png(fig)
+            finally:
+                plt.close(fig)
+
+        _charts[key] = png
+        _stats["renders"] += 1
+        while len(_charts) > MAX_CHARTS:
+            _charts.popitem(last=False)
+        return png
+
+
+def chart_cache_stats():
+    with _lock:
+        return dict(_stats, cached=len(_charts), open_figures=len(plt.get_fignums()))
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+# ------------------------------------------
+# Thresholds used by the credit story
+# ------------------------------------------
+HIGH_UTILIZATION = 30        # % of the limit in use
+SHORT_HISTORY_MONTHS = 24
+MAX_INQUIRIES = 2            # new inquiries in the last 6 months
+MIN_ON_TIME = 85             # % of payments on time
+
+STORY_TEMPLATE = """### 🔍 Credit Summary
+
+📊 Credit Utilization: {:.2f}%  
+{}
+
+💳 Loan Balance: ₹{}  
+📆 Monthly Payment: ₹{}  
+{}
+
+📈 Credit Age: {} months  
+{}
+
+📁 Credit Types: {}  
+🔍 New Credit Inquiries (6 months): {}  
+{}
+
+✅ On-Time Payment %: {}%  
+{}
+"""
+
+
+def _whole(value):
+    """Whole-number floats as ints: a row of a mixed-dtype frame upcasts its ints ("54693.0" -> "54693")."""
+    return int(value) if isinstance(value, float) and value.is_integer() else value
+
+
+def _whole_list(column):
+    return [_whole(v) for v in column.tolist()]
+
+
+# ------------------------------------------
+# Credit Score Storytelling Function
+# ------------------------------------------
+def credit_score_insights(row):
+    utilization = (row['Total Credit Limit'] - row['Available Credit']) / row['Total Credit Limit'] * 100
+    missed = _whole(row['Number of Missed Payments'])
+    age = _whole(row['Credit Age (in months)'])
+    inquiries = _whole(row['New Credit Inquiries (last 6 months)'])
+    on_time = _whole(row['On-Time Payment Percentage'])
+
+    return STORY_TEMPLATE.format(
+        utilization,
+        "⚠️ High credit utilization. Try to keep it below 30%." if utilization > HIGH_UTILIZATION else "✅ Good credit utilization.",
+        _whole(row['Loan Balance']),
+        _whole(row['Monthly Loan Payment']),
+        "🚨 Missed Payments: " + str(missed) if missed > 0 else "✅ No missed payments.",
+        age,
+        "⚠️ Short credit history." if age < SHORT_HISTORY_MONTHS else "✅ Healthy credit age.",
+        _whole(row['Number of Credit Types (loan, card)']),
+        inquiries,
+        "⚠️ Too many inquiries. Space out new applications." if inquiries > MAX_INQUIRIES else "",
+        on_time,
+        "⚠️ Improve on-time payments." if on_time < MIN_ON_TIME else "🎯 Great on-time record!",
+    )
+
+
+# ------------------------------------------
+# Whole-table version
+# ------------------------------------------
+def credit_flags(df):
+    """Utilization (%) and every story threshold as vectorized columns, aligned to df."""
+    limit = df['Total Credit Limit'].to_numpy(dtype=float)
+    utilization = (limit - df['Available Credit'].to_numpy(dtype=float)) / limit * 100
+    return pd.DataFrame({
+        "utilization": utilization,
+        "high_utilization": utilization > HIGH_UTILIZATION,
+        "missed_payments": df['Number of Missed Payments'].to_numpy() > 0,
+        "short_history": df['Credit Age (in months)'].to_numpy() < SHORT_HISTORY_MONTHS,
+        "many_inquiries": df['New Credit Inquiries (last 6 months)'].to_numpy() > MAX_INQUIRIES,
+        "low_on_time": df['On-Time Payment Percentage'].to_numpy() < MIN_ON_TIME,
+    }, index=df.index)
+
+
+def _pick(flag, when_true, when_false):
+    return np.where(flag, when_true, when_false).tolist()
+
+
+def credit_stories(df):
+    """credit_score_insights for every row of df, as a list of strings in row order (the same text)."""
+    flags = credit_flags(df)
+    missed_text = ["🚨 Missed Payments: " + str(v) for v in _whole_list(df['Number of Missed Payments'])]
+
+    return list(map(
+        STORY_TEMPLATE.format,
+        flags["utilization"].tolist(),
+        _pick(flags["high_utilization"], "⚠️ High credit utilization. Try to keep it below 30%.", "✅ Good credit utilization."),
+        _whole_list(df['Loan Balance']),
+        _whole_list(df['Monthly Loan Payment']),
+        _pick(flags["missed_payments"], missed_text, "✅ No missed payments."),
+        _whole_list(df['Credit Age (in months)']),
+        _pick(flags["short_history"], "⚠️ Short credit history.", "✅ Healthy credit age."),
+        _whole_list(df['Number of Credit Types (loan, card)']),
+        _whole_list(df['New Credit Inquiries (last 6 months)']),
+        _pick(flags["many_inquiries"], "⚠️ Too many inquiries. Space out new applications.", ""),
+        _whole_list(df['On-Time Payment Percentage']),
+        _pick(flags["low_on_time"], "⚠️ Improve on-time payments.", "🎯 Great on-time record!"),
+    ))
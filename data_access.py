@@ -0,0 +1,154 @@
+"""Shared data access for the FinTalk Pro apps.
+
+Each dataset is read from a Parquet copy (dtypes and parsed timestamps stored,
+only the requested columns read) when one exists and is at least as new as the
+CSV, otherwise from the CSV. Convert the shipped CSVs with:
+
+    python data_access.py                 # every dataset, all columns
+    python data_access.py risk --prune    # only the columns the pages use
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = os.environ.get("FINTALK_DATA_DIR", os.path.dirname(os.path.abspath(__file__)))
+
+
+def _normalize_columns(df):
+    df.columns = df.columns.str.strip().str.lower().str.replace(" ", "_")
+    return df
+
+
+def _prepare_risk(df):
+    df["transaction_time"] = pd.to_datetime(df["transaction_time"])
+    return df
+
+
+def prepare_trend(df):
+    df["transaction_datetime"] = pd.to_datetime(df["transaction_date"] + " " + df["transaction_time"])
+    df["amount"] = pd.to_numeric(df["amount"], errors="coerce")
+    df["balance"] = pd.to_numeric(df["balance"], errors="coerce")
+    return df
+
+
+def _prepare_portfolio(df):
+    df["timestamp"] = pd.to_datetime(df["timestamp"])
+    return df
+
+
+# name -> (csv file, post-read preparation, columns the dashboard pages use)
+DATASETS = {
+    "personal": ("personal_data_dataset.csv", _normalize_columns, [
+        "transaction_category", "recent_transaction_amount", "monthly_income", "monthly_expenses",
+        "groceries_budget", "groceries_spent", "loan_balance", "monthly_loan_payment",
+        "credit_utilization_(%)", "security_alert_type",
+    ]),
+    "risk": ("user_risk_features_dataset.csv", _prepare_risk, [
+        "user_id", "monthly_income", "monthly_expenses", "credit_utilization_percent", "monthly_loan_payment",
+        "groceries_budget", "groceries_spent", "account_balance", "transaction_amount", "transaction_time",
+        "merchant", "transaction_category", "is_foreign", "is_large", "is_unusual_time", "security_alert_type",
+        "emi_count",
+    ]),
+    "trend": ("trends_dataset.csv", prepare_trend, [
+        "transaction_id", "transaction_datetime", "transaction_category", "merchant", "amount", "balance", "user_id",
+    ]),
+    "portfolio": ("bank_investment_portfolio_dataset.csv", _prepare_portfolio, None),
+    "credit": ("credit_data.csv", None, None),
+}
+
+
+def csv_path(name):
+    env = os.environ.get(f"FINTALK_{name.upper()}_CSV")
+    return env or os.path.join(DATA_DIR, DATASETS[name][0])
+
+
+def parquet_path(name):
+    return os.path.splitext(csv_path(name))[0] + ".parquet"
+
+
+def _parquet_supported():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _use_parquet(name):
+    pq, csv = parquet_path(name), csv_path(name)
+    if not os.path.exists(pq) or not _parquet_supported():
+        return False
+    return not os.path.exists(csv) or os.path.getmtime(pq) >= os.path.getmtime(csv)
+
+
+def read_csv(name):
+    _, prepare, _ = DATASETS[name]
+    df = pd.read_csv(csv_path(name))
+    return prepare(df) if prepare else df
+
+
+def load_dataset(name, columns="app"):
+    """Load a dataset. columns: "app" (the page's columns), None (all) or a list."""
+    if columns == "app":
+        columns = DATASETS[name][2]
+
+    if _use_parquet(name):
+        return pd.read_parquet(parquet_path(name), columns=columns)
+
+    df = read_csv(name)
+    return df[columns] if columns is not None else df
+
+
+def data_version(name):
+    """(path, mtime_ns, size) of the file load_dataset(name) reads - changes whenever the data does."""
+    path = parquet_path(name) if _use_parquet(name) else csv_path(name)
+    st = os.stat(path)
+    return path, st.st_mtime_ns, st.st_size
+
+
+class UserIndex:
+    """Rows sorted by user once, with per-user offsets, so fetching a client is a slice, not a scan."""
+
+    def __init__(self, df, key="user_id"):
+        keys = df[key].to_numpy()
+        order = np.argsort(keys, kind="stable")
+        self.frame = df.iloc[order]  # original index kept, so per-row side tables still align
+        sorted_keys = keys[order]
+        self.user_ids, self.starts = np.unique(sorted_keys, return_index=True)
+        self.stops = np.append(self.starts[1:], len(sorted_keys))
+
+    def __contains__(self, user_id):
+        i = np.searchsorted(self.user_ids, user_id)
+        return i < len(self.user_ids) and self.user_ids[i] == user_id
+
+    def rows(self, user_id):
+        i = np.searchsorted(self.user_ids, user_id)
+        if i == len(self.user_ids) or self.user_ids[i] != user_id:
+            return self.frame.iloc[0:0]
+        return self.frame.iloc[self.starts[i]:self.stops[i]]
+
+
+def convert_to_parquet(name, prune=False):
+    df = read_csv(name)
+    if prune and DATASETS[name][2] is not None:
+        df = df[DATASETS[name][2]]
+    out = parquet_path(name)
+    df.to_parquet(out, index=False)
+    return out, len(df), len(df.columns)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert FinTalk CSV datasets to Parquet")
+    parser.add_argument("datasets", nargs="*", default=list(DATASETS), choices=list(DATASETS))
+    parser.add_argument("--prune", action="store_true", help="keep only the columns the dashboards read")
+    args = parser.parse_args(argv)
+
+    for name in args.datasets:
+        out, rows, cols = convert_to_parquet(name, args.prune)
+        print(f"{name}: {rows} rows x {cols} columns -> {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+"""FinTalk Pro analytics, without Streamlit.
+
+One module per dashboard, each a set of plain functions over the loaded
+datasets (data_access.load_dataset) that return numbers, dicts and frames:
+
+    from data_access import load_dataset
+    from fintalk import personal
+
+    personal.financial_summary(load_dataset("personal"))
+
+The Streamlit pages only render what these return, so batch jobs, benchmarks
+and services get exactly the numbers the dashboards show.
+"""
+from fintalk import credit, personal, portfolio, risk, trend
+
+__all__ = ["credit", "personal", "portfolio", "risk", "trend"]
@@ -0,0 +1,16 @@
+from credit_insights import credit_flags, credit_score_insights, credit_stories  # noqa: F401
+from credit_model import credit_features, score_band, score_batch
+
+# --- Credit storytelling: scores, bands and the insight text per profile ---
+
+
+def credit_scores(df):
+    """300-900 score for every row of credit_data.csv."""
+    return score_batch(credit_features(df))
+
+
+def credit_profile(df, position=0):
+    """The profile at position: its fields, score, band and insight story."""
+    row = df.iloc[[position]].astype(object).iloc[0]  # keeps each column's type (df.iloc[position] upcasts ints)
+    score = float(credit_scores(df.iloc[[position]])[0])
+    return {"profile": row, "score": score, "band": score_band(score), "insights": credit_score_insights(row)}
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+# --- Personal dashboard: financial summary, spending, utilization, groceries ---
+
+UTILIZATION_LIMIT = 30
+GROCERIES_NEAR_LIMIT = 0.8  # share of the budget from which spending is "Near Limit"
+
+
+def financial_summary(df):
+    """Average monthly income and expenses, and the net savings between them."""
+    income = float(df["monthly_income"].mean())
+    expenses = float(df["monthly_expenses"].mean())
+    return {"income": income, "expenses": expenses, "net_savings": income - expenses}
+
+
+def spending_by_category(df):
+    """Recent transaction totals per category, largest spend (most negative) first."""
+    return df.groupby("transaction_category")["recent_transaction_amount"].sum().sort_values()
+
+
+def credit_utilization(df):
+    """Average credit utilization (%) and whether it is under UTILIZATION_LIMIT."""
+    avg_util = float(df["credit_utilization_(%)"].mean())
+    return {"avg_util": avg_util, "healthy": avg_util <= UTILIZATION_LIMIT}
+
+
+def groceries_status(df):
+    """'Over Budget', 'Near Limit' or 'Under Budget' for every row."""
+    spent, budget = df["groceries_spent"], df["groceries_budget"]
+    status = np.where(spent > budget, "Over Budget",
+                      np.where(spent > GROCERIES_NEAR_LIMIT * budget, "Near Limit", "Under Budget"))
+    return pd.Series(status, index=df.index, name="groceries_status")
+
+
+def report_text(df, note=""):
+    """The plain-text financial report (the PDF's content); note is appended when not blank."""
+    summary = financial_summary(df)
+    report = "📊 Financial Report Summary\n\n"
+    report += f"Avg Monthly Income: ₹{summary['income']:.2f}\n"
+    report += f"Avg Monthly Expenses: ₹{summary['expenses']:.2f}\n"
+    report += f"Net Savings: ₹{summary['net_savings']:.2f}\n\n"
+    report += "Top Spending Categories:\n"
+    for cat, amt in spending_by_category(df).items():
+        report += f" - {cat}: ₹{abs(amt):.2f}\n"
+    report += f"\nAvg Credit Utilization: {credit_utilization(df)['avg_util']:.2f}%\n"
+
+    note = note.strip()
+    if note:
+        report += f"\n---\n📌 Advisor Notes:\n{note}\n"
+    return report
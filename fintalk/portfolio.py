@@ -0,0 +1,24 @@
+from portfolio_engine import HOLDING_COLUMNS, PortfolioMetrics, summarize_holdings, to_inr  # noqa: F401
+from portfolio_history import PortfolioHistory  # noqa: F401
+
+# --- Portfolio dashboard: per-client metrics, allocation, history and advice ---
+# PortfolioMetrics(to_inr(holdings)) answers every client's headline metrics,
+# sector values and risk mix; PortfolioHistory their valuation over time.
+
+HIGH_RISK_LIMIT = 0.5  # share of high-risk holdings above which diversifying is suggested
+
+
+def client_overview(metrics, user_id):
+    """Headline metrics, sector values and risk counts for one client, as plain data."""
+    return {
+        "summary": metrics.user_summary(user_id),
+        "sectors": metrics.sector_values(user_id),
+        "risk_levels": metrics.risk_counts(user_id),
+    }
+
+
+def strategic_advice(summary):
+    """The page's one-line recommendation for a client's summary."""
+    if summary["high_risk_ratio"] > HIGH_RISK_LIMIT:
+        return "Consider diversifying into low-risk instruments for better stability."
+    return "Your portfolio is well balanced. Continue monitoring market trends."
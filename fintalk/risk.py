@@ -0,0 +1,52 @@
+from anomaly_stream import score_frame
+from risk_engine import compute_risk_metrics  # noqa: F401
+from risk_engine import (
+    DAILY_ANOMALY_LIMIT, EMI_LIMIT, REPAYMENT_LIMIT, UTILIZATION_LIMIT, VOLATILITY_LIMIT,
+    daily_anomaly_counts, suspicious_mask,
+)
+
+# --- Risk analyzer: per-client metrics, flags and the transactions behind them ---
+# compute_risk_metrics(df) gives every client's metrics (indexed by user_id) in one
+# pass; the helpers below take one client's rows (data_access.UserIndex.rows).
+
+
+def anomaly_scores(df):
+    """Rolling per-user / per-category z-scores for every transaction, replayed in time order."""
+    return score_frame(df, "transaction_time", ["user_id", "transaction_category"], "transaction_amount")
+
+
+def risk_flags(metrics):
+    """Which of the page's warnings apply to a client's metrics row."""
+    return {
+        "high_utilization": bool(metrics["avg_util"] > UTILIZATION_LIMIT),
+        "high_repayment_burden": bool(metrics["avg_ratio"] > REPAYMENT_LIMIT),
+        "over_budget": bool(metrics["over_budget_count"] > 0),
+        "volatile_income": bool(metrics["volatility_ratio"] > VOLATILITY_LIMIT),
+        "suspicious_transactions": bool(metrics["suspicious_count"] > 0),
+        "low_balance": bool(metrics["low_balance_count"] > 0),
+        "emi_overload": bool(metrics["avg_emi_count"] > EMI_LIMIT),
+        "high_risk_days": bool(metrics["high_risk_days"] > 0),
+    }
+
+
+def suspicious_transactions(rows):
+    """Large, foreign or unusual-time transactions."""
+    return rows[suspicious_mask(rows)]
+
+
+def stat_outliers(rows, scores):
+    """rows that the rolling detector flagged, with their anomaly_score; scores: anomaly_scores output."""
+    scores = scores.loc[rows.index]
+    return rows[scores["is_anomaly"]].assign(anomaly_score=scores["anomaly_score"])
+
+
+def security_alerts(rows):
+    return rows[rows["security_alert_type"].notnull()]
+
+
+def high_risk_days(rows):
+    """DataFrame [date_only, Suspicious Txns] of days with more than DAILY_ANOMALY_LIMIT suspicious transactions."""
+    daily = daily_anomaly_counts(rows).droplevel("user_id")
+    days = daily[daily > DAILY_ANOMALY_LIMIT].rename("Suspicious Txns").reset_index()
+    days["date_only"] = days["date_only"].dt.date
+    return days
@@ -0,0 +1,40 @@
+import pandas as pd
+
+from trend_cube import balance_curve, bucket_totals, minute_totals, totals  # noqa: F401 (cube aggregates, re-exported)
+from trend_feed import CANDIDATE_MIN_AMOUNT, TrendFeed  # noqa: F401
+
+# --- Trend analysis: filters, cumulative balance and outliers over the feed ---
+# TrendFeed keeps the transaction rows and the (day, minute, category, type)
+# cube; a reader takes feed.snapshot() once and answers everything from it:
+# aggregates and the balance curve from snapshot.view(...), outliers from
+# snapshot.candidates through the helpers below. Neither grows with the feed.
+
+OUTLIER_THRESHOLD = 25_000  # absolute amount
+
+
+def filter_transactions(rows, start_date=None, end_date=None, categories=None):
+    """Feed rows (e.g. snapshot.candidates) inside the date range (inclusive, by transaction day) and category selection."""
+    mask = pd.Series(True, index=rows.index)
+    if start_date is not None:
+        mask &= rows["transaction_day"] >= pd.Timestamp(start_date)
+    if end_date is not None:
+        mask &= rows["transaction_day"] <= pd.Timestamp(end_date)
+    if categories is not None:
+        mask &= rows["transaction_category"].isin(categories)
+    return rows[mask]
+
+
+def amount_outliers(rows, threshold=OUTLIER_THRESHOLD):
+    """Transactions whose absolute amount is over threshold (at least CANDIDATE_MIN_AMOUNT for candidate rows)."""
+    return rows[rows["amount"].abs() > threshold]
+
+
+def stat_outliers(rows):
+    """Transactions the rolling per-user / per-category detector flagged as they arrived."""
+    return rows[rows["is_stat_anomaly"].astype(bool)]
+
+
+def trend_summary(cells):
+    """Transaction count and income / expense totals of cube cells (feed.cube.view output)."""
+    transaction_count, income, expense = totals(cells)
+    return {"transaction_count": transaction_count, "total_income": float(income), "total_expense": float(expense)}
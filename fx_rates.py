@@ -0,0 +1,74 @@
+import functools
+import os
+
+import numpy as np
+import pandas as pd
+
+from data_access import DATA_DIR
+
+# --- Dated FX rates (no Streamlit) ---
+#
+# Rates come from a local CSV with one row per (date, currency):
+#
+#     date,currency,inr_per_unit
+#     2000-01-01,USD,83.0
+#
+# A rate applies from its date until the next one for that currency. Amounts
+# are converted with an as-of join on each row's date (rows dated before a
+# currency's first rate use that first rate). Parsed tables are cached per
+# file modification time; conversions always return a new frame.
+
+RATES_PATH = os.environ.get("FINTALK_FX_RATES", os.path.join(DATA_DIR, "fx_rates.csv"))
+BASE_CURRENCY = "INR"
+BOOK_CURRENCY = os.environ.get("FINTALK_BOOK_CURRENCY", "USD")  # holdings without a 'currency' column
+
+
+class RateTable:
+    def __init__(self, frame):
+        frame = frame.assign(date=pd.to_datetime(frame["date"]), currency=frame["currency"].str.upper())
+        frame = frame.sort_values(["currency", "date"], kind="stable")
+        self.by_currency = {
+            currency: (group["date"].to_numpy("datetime64[ns]"), group["inr_per_unit"].to_numpy(dtype=float))
+            for currency, group in frame.groupby("currency", sort=False)
+        }
+
+    def rates(self, currency, when):
+        """INR per unit of currency in force at each of the datetime64 values in when."""
+        currency = currency.upper()
+        if currency == BASE_CURRENCY:
+            return np.ones(len(when))
+        if currency not in self.by_currency:
+            raise KeyError(f"No FX rates for {currency} in the rate table")
+        dates, rates = self.by_currency[currency]
+        idx = np.searchsorted(dates, when, side="right") - 1
+        return rates[idx.clip(0)]
+
+
+@functools.lru_cache(maxsize=8)
+def _load(path, mtime_ns):
+    return RateTable(pd.read_csv(path))
+
+
+def rates_version(path=RATES_PATH):
+    return os.stat(path).st_mtime_ns
+
+
+def load_rates(path=RATES_PATH):
+    return _load(path, rates_version(path))
+
+
+def convert(df, columns, currency=BOOK_CURRENCY, date_col="timestamp", rates=None):
+    """Copy of df with columns in INR at each row's dated rate; a 'currency' column overrides currency per row."""
+    rates = rates or load_rates()
+    when = pd.to_datetime(df[date_col]).to_numpy("datetime64[ns]")
+
+    if "currency" in df.columns:
+        codes = df["currency"].to_numpy()
+        factor = np.empty(len(df))
+        for code in pd.unique(codes):
+            mask = codes == code
+            factor[mask] = rates.rates(code, when[mask])
+    else:
+        factor = rates.rates(currency, when)
+
+    return df.assign(**{col: df[col].to_numpy(dtype=float) * factor for col in columns})
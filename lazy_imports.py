@@ -0,0 +1,132 @@
+"""Deferred imports for the heavy optional modules, plus an import-time report.
+
+    plt = lazy("matplotlib.pyplot")   # nothing is imported until plt.<attr> is used
+
+Set FINTALK_EAGER_IMPORTS=1 to import everything up front instead (e.g. to
+surface a missing dependency at start-up). Profile what each app pays at
+start-up, per module, with:
+
+    python lazy_imports.py personal_data.py risk.py trend.py portfolio.py credit_score.py
+"""
+import importlib
+import os
+import sys
+import threading
+import time
+import types
+
+EAGER = os.environ.get("FINTALK_EAGER_IMPORTS") == "1"
+
+_lock = threading.Lock()
+_load_times = {}   # module name -> ms spent importing it on first use
+
+
+class LazyModule(types.ModuleType):
+    """Stands in for a module and imports it on first attribute access."""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            start = time.perf_counter()
+            module = importlib.import_module(self.__name__)
+            with _lock:
+                _load_times.setdefault(self.__name__, (time.perf_counter() - start) * 1000)
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy(name):
+    if EAGER or name in sys.modules:
+        return importlib.import_module(name)
+    return LazyModule(name)
+
+
+def load_times():
+    """{module: ms} for the lazy modules imported so far in this process."""
+    with _lock:
+        return dict(_load_times)
+
+
+# --------------------------------------
+# Start-up import profile (python -X importtime over each app's top-level imports)
+# --------------------------------------
+# The profiling helpers import what they need themselves, so importing this
+# module stays cheap for the apps.
+_MARKER = "--fintalk-imports--"
+
+
+def app_imports(path):
+    """The app's module-level imports and lazy(...) assignments, as source lines."""
+    import ast
+
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    lines = []
+    for node in tree.body:
+        is_lazy = (isinstance(node, ast.Assign) and isinstance(node.value, ast.Call)
+                   and getattr(node.value.func, "id", None) == "lazy")
+        if isinstance(node, (ast.Import, ast.ImportFrom)) or is_lazy:
+            lines.append(ast.unparse(node))
+    return lines
+
+
+def profile_imports(path, eager=False):
+    """Run the app's imports in a fresh interpreter; returns ({top-level package: cumulative ms}, total ms)."""
+    import re
+    import subprocess
+    from collections import defaultdict
+
+    env = dict(os.environ, FINTALK_EAGER_IMPORTS="1" if eager else "0")
+    code = "\n".join([f"import sys; sys.stderr.write({_MARKER!r} + '\\n')"] + app_imports(path))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=os.path.dirname(os.path.abspath(path)),
+                          env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{path}: imports failed: {proc.stderr.strip().splitlines()[-1]}")
+
+    pattern = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+    per_package = defaultdict(float)
+    started = False
+    for line in proc.stderr.splitlines():
+        if line == _MARKER:
+            started = True  # everything before this is interpreter start-up
+            continue
+        m = pattern.match(line)
+        if started and m and len(m.group(3)) == 1:  # direct imports; nested ones are in their cumulative time
+            per_package[m.group(4).split(".")[0]] += int(m.group(2)) / 1000
+    return dict(per_package), sum(per_package.values())
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Per-module import time of each app's start-up.")
+    parser.add_argument("apps", nargs="+")
+    parser.add_argument("--top", type=int, default=8)
+    parser.add_argument("--eager", action="store_true", help="also profile with FINTALK_EAGER_IMPORTS=1")
+    args = parser.parse_args(argv)
+
+    for app in args.apps:
+        modes = [("lazy", False)] + ([("eager", True)] if args.eager else [])
+        for label, eager in modes:
+            try:
+                packages, total = profile_imports(app, eager)
+            except RuntimeError as e:
+                print(e)
+                continue
+            print(f"{app} ({label}): {total:.0f} ms")
+            for name, ms in sorted(packages.items(), key=lambda kv: -kv[1])[:args.top]:
+                print(f"    {name:24s} {ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# --------------------------------------
+# 🤖 Shared Hugging Face model registry
+# --------------------------------------
+# Every FinTalk Pro app pulls its transformer pipelines from here so each model
+# is loaded once per process and stays warm across Streamlit reruns and
+# autorefresh ticks. Models are evicted least-recently-used once more than
+# MAX_MODELS distinct (task, model) pairs are resident.
+
+MAX_MODELS = int(os.environ.get("FINTALK_MAX_MODELS", "3"))
+
+SUMMARY_MODEL = "facebook/bart-large-cnn"
+FAST_SUMMARY_MODEL = "sshleifer/distilbart-cnn-12-6"
+TEXT_MODEL = "gpt2"
+
+_lock = threading.Lock()
+_models = OrderedDict()   # (task, model) -> TimedPipeline
+_loading = {}             # (task, model) -> threading.Lock
+_stats = {}               # (task, model) -> timing dict
+
+
+def _new_stats():
+    return {"loads": 0, "load_seconds": 0.0, "calls": 0, "inference_seconds": 0.0,
+            "last_inference_seconds": 0.0, "evictions": 0}
+
+
+def _pad_for_batching(task, pipe):
+    """Let decoder-only text generation (GPT-2 has no pad token) take batches of unequal-length prompts."""
+    tokenizer = getattr(pipe, "tokenizer", None)
+    if task != "text-generation" or tokenizer is None or tokenizer.pad_token_id is not None:
+        return
+    tokenizer.pad_token_id = pipe.model.config.eos_token_id
+    tokenizer.padding_side = "left"   # generation continues from the right end of each prompt
+    pipe.model.generation_config.pad_token_id = tokenizer.pad_token_id
+
+
+class TimedPipeline:
+    """Wraps a transformers pipeline and records inference timings."""
+
+    def __init__(self, key, pipe):
+        self.key = key
+        self.pipe = pipe
+
+    def __call__(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self.pipe(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            with _lock:
+                stats = _stats.setdefault(self.key, _new_stats())
+                stats["calls"] += 1
+                stats["inference_seconds"] += elapsed
+                stats["last_inference_seconds"] = elapsed
+
+
+def get_pipeline(task, model):
+    key = (task, model)
+    with _lock:
+        if key in _models:
+            _models.move_to_end(key)
+            return _models[key]
+        key_lock = _loading.setdefault(key, threading.Lock())
+
+    # Load outside the registry lock so other models stay usable meanwhile;
+    # the per-key lock stops two sessions loading the same weights twice.
+    with key_lock:
+        with _lock:
+            if key in _models:
+                _models.move_to_end(key)
+                return _models[key]
+
+        from transformers import pipeline
+
+        start = time.perf_counter()
+        raw = pipeline(task, model=model)
+        _pad_for_batching(task, raw)
+        pipe = TimedPipeline(key, raw)
+        elapsed = time.perf_counter() - start
+
+        with _lock:
+            stats = _stats.setdefault(key, _new_stats())
+            stats["loads"] += 1
+            stats["load_seconds"] += elapsed
+            _models[key] = pipe
+            while len(_models) > MAX_MODELS:
+                evicted, _ = _models.popitem(last=False)
+                _stats[evicted]["evictions"] += 1
+            return pipe
+
+
+def model_stats():
+    with _lock:
+        report = {}
+        for (task, model), stats in _stats.items():
+            row = dict(stats)
+            row["loaded"] = (task, model) in _models
+            row["avg_inference_seconds"] = stats["inference_seconds"] / stats["calls"] if stats["calls"] else 0.0
+            report[f"{task}:{model}"] = row
+        return report
+
+
+def clear_models():
+    with _lock:
+        _models.clear()
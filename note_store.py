@@ -0,0 +1,213 @@
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+# -------------------------------------------------
+# 🗒️ Shared advisor-note store
+# -------------------------------------------------
+# One SQLite database (WAL mode) for every app, keyed by (app, user_id).
+# Reads are served from an in-memory cache that is dropped whenever another
+# connection - e.g. another dashboard process - commits (PRAGMA data_version).
+# Writes land in the cache immediately and are persisted by a background
+# thread in batches, each batch in a single transaction, so a save is atomic
+# and never blocks the page. A batch that fails to commit (e.g. the database
+# is locked) stays queued and is retried.
+
+DB_PATH = os.environ.get("FINTALK_NOTES_DB", "advisor_notes.sqlite3")
+FLUSH_INTERVAL = float(os.environ.get("FINTALK_NOTES_FLUSH_SECONDS", "0.5"))
+RETRY_SECONDS = (1, 2, 5, 10, 30)   # back-off between attempts at a failing batch
+EXIT_FLUSH_TIMEOUT = 10
+
+log = logging.getLogger(__name__)
+
+# Per-app note files used before the shared store: (app, user_id) -> (path, format)
+LEGACY_FILES = {
+    ("personal", "1"): ("advisor_note_dashboard.txt", "text"),
+    ("credit", "0"): ("advisor_note_credit.txt", "text"),
+    ("portfolio", "1"): ("advisor_note.txt", "text"),
+    ("trend", "all"): ("advisor_note.txt", "text"),
+    ("risk", "1017"): ("advisor_note.json", "json"),
+}
+
+_DELETED = object()
+
+
+class NoteStore:
+    def __init__(self, path=DB_PATH, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._conn = self._connect()
+        self._conn_lock = threading.Lock()
+        self._cache = {}
+        self._pending = {}
+        self._cond = threading.Condition()
+        self._data_version = self._read_data_version()
+        self._writer = threading.Thread(target=self._write_loop, name="fintalk-notes", daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS advisor_notes ("
+            "app TEXT NOT NULL, user_id TEXT NOT NULL, note TEXT NOT NULL, updated REAL NOT NULL, "
+            "PRIMARY KEY (app, user_id))"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        return conn
+
+    def _read_data_version(self):
+        with self._conn_lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    # --- reads ---
+    def get(self, app, user_id):
+        """The saved note for (app, user_id), or "" when there is none."""
+        key = (app, str(user_id))
+        version = self._read_data_version()
+        with self._cond:
+            if version != self._data_version:
+                # Another process committed since we last looked
+                self._cache.clear()
+                self._data_version = version
+            if key in self._pending:
+                value = self._pending[key]
+                return "" if value is _DELETED else value
+            if key in self._cache:
+                return self._cache[key]
+
+        with self._conn_lock:
+            row = self._conn.execute(
+                "SELECT note FROM advisor_notes WHERE app = ? AND user_id = ?", key
+            ).fetchone()
+        note = row[0] if row else ""
+        with self._cond:
+            if key not in self._pending:
+                self._cache[key] = note
+        return note
+
+    def invalidate(self, app=None, user_id=None):
+        with self._cond:
+            if app is None:
+                self._cache.clear()
+            else:
+                self._cache.pop((app, str(user_id)), None)
+
+    # --- writes ---
+    def set(self, app, user_id, note):
+        self._enqueue((app, str(user_id)), note)
+
+    def delete(self, app, user_id):
+        self._enqueue((app, str(user_id)), _DELETED)
+
+    def _enqueue(self, key, value):
+        with self._cond:
+            self._pending[key] = value
+            self._cache[key] = "" if value is _DELETED else value
+            self._cond.notify()
+
+    def flush(self, timeout=None):
+        """Block until every queued write is committed; False if some are still queued after timeout seconds."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._cond.notify()
+            while self._pending:
+                if deadline is not None and time.monotonic() >= deadline:
+                    return False
+                self._cond.wait(0.05)
+        return True
+
+    def _write_loop(self):
+        failures = 0
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+            time.sleep(self.flush_interval)  # let a burst of saves coalesce into one batch
+            with self._cond:
+                batch = dict(self._pending)
+            try:
+                self._commit(batch)
+            except Exception:
+                # Keep the batch queued (reads still see it) and try again later
+                log.exception("Saving %d advisor note(s) to %s failed; retrying", len(batch), self.path)
+                time.sleep(RETRY_SECONDS[min(failures, len(RETRY_SECONDS) - 1)])
+                failures += 1
+                continue
+            failures = 0
+            with self._cond:
+                for key, value in batch.items():
+                    if self._pending.get(key, None) is value:
+                        del self._pending[key]
+                self._cond.notify_all()
+
+    def _commit(self, batch):
+        now = time.time()
+        upserts = [(app, user, note, now) for (app, user), note in batch.items() if note is not _DELETED]
+        deletes = [key for key, note in batch.items() if note is _DELETED]
+        with self._conn_lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO advisor_notes (app, user_id, note, updated) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(app, user_id) DO UPDATE SET note = excluded.note, updated = excluded.updated",
+                    upserts,
+                )
+                self._conn.executemany("DELETE FROM advisor_notes WHERE app = ? AND user_id = ?", deletes)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    # --- one-off migration from the per-app files ---
+    def import_legacy_files(self, base_dir="."):
+        """Copy the per-app note files in once per database; later calls (and processes) are no-ops."""
+        notes = {}
+        for (app, user_id), (name, fmt) in LEGACY_FILES.items():
+            path = os.path.join(base_dir, name)
+            if not os.path.exists(path):
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                notes[(app, user_id)] = json.load(f).get("note", "") if fmt == "json" else f.read()
+
+        imported = []
+        with self._conn_lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                done = self._conn.execute("SELECT 1 FROM store_meta WHERE key = 'legacy_files_imported'").fetchone()
+                if not done:
+                    for (app, user_id), note in notes.items():
+                        cur = self._conn.execute(
+                            "INSERT OR IGNORE INTO advisor_notes (app, user_id, note, updated) VALUES (?, ?, ?, ?)",
+                            (app, user_id, note, time.time()),
+                        )
+                        if cur.rowcount:
+                            imported.append((app, user_id))
+                    self._conn.execute("INSERT INTO store_meta (key, value) VALUES ('legacy_files_imported', ?)",
+                                       (str(time.time()),))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return imported
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Process-wide NoteStore (legacy note files are imported on first use)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = NoteStore()
+            _store.import_legacy_files()
+            atexit.register(_store.flush, EXIT_FLUSH_TIMEOUT)
+        return _store
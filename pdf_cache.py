@@ -0,0 +1,114 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from profiling import section
+
+# -------------------------------------------------
+# 📄 Lazy, memoized PDF reports
+# -------------------------------------------------
+# Reports are only rendered when someone asks for a download, on a shared
+# thread pool, and the bytes are kept (LRU) under a hash of everything that
+# goes into the report - data plus advisor note - so reruns and other
+# sessions with the same inputs reuse them. The page never waits on a render:
+# a small fragment polls for it and reruns the page once the bytes are there.
+
+MAX_REPORTS = int(os.environ.get("FINTALK_PDF_CACHE_SIZE", "64"))
+POLL_SECONDS = 0.5
+_executor = ThreadPoolExecutor(max_workers=int(os.environ.get("FINTALK_PDF_WORKERS", "2")),
+                               thread_name_prefix="fintalk-pdf")
+_lock = threading.Lock()
+_reports = OrderedDict()   # key -> bytes
+_pending = {}              # key -> Future
+
+
+def content_hash(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, (pd.DataFrame, pd.Series)):
+            h.update(pd.util.hash_pandas_object(part, index=True).values.tobytes())
+            h.update(repr(list(part.columns) if isinstance(part, pd.DataFrame) else part.name).encode())
+        else:
+            h.update(repr(part).encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+def _to_bytes(result):
+    if hasattr(result, "getvalue"):
+        return result.getvalue()
+    return bytes(result)
+
+
+def cached_report(key):
+    with _lock:
+        if key in _reports:
+            _reports.move_to_end(key)
+            return _reports[key]
+    return None
+
+
+def _store(key, future):
+    with _lock:
+        _pending.pop(key, None)
+        if future.exception() is None:
+            _reports[key] = future.result()
+            while len(_reports) > MAX_REPORTS:
+                _reports.popitem(last=False)
+
+
+def _render(build, args):
+    with section(f"pdf.{build.__name__}"):
+        return _to_bytes(build(*args))
+
+
+def pending_report(key):
+    """The Future of a render in progress for key, or None."""
+    with _lock:
+        return _pending.get(key)
+
+
+def render_async(key, build, *args):
+    """Start rendering build(*args) in the background (once per key); returns a Future of bytes."""
+    with _lock:
+        if key in _pending:
+            return _pending[key]
+        future = _executor.submit(_render, build, args)
+        _pending[key] = future
+    future.add_done_callback(lambda f: _store(key, f))
+    return future
+
+
+def download_when_ready(label, key, build, *args, file_name, mime="application/pdf"):
+    """Streamlit helper: a download button once the report exists, else a button that renders it."""
+    import streamlit as st
+
+    error_key = f"_pdf_error_{file_name}"
+    pdf = cached_report(key)
+    if pdf is not None:
+        st.download_button(label, data=pdf, file_name=file_name, mime=mime)
+        return
+    if error_key in st.session_state:
+        st.error(f"Rendering {file_name} failed: {st.session_state.pop(error_key)}")
+
+    future = pending_report(key)
+    if future is None:
+        if not st.button(f"🛠️ Prepare {file_name}", key=f"prepare_{file_name}"):
+            return
+        future = render_async(key, build, *args)
+
+    # Rendering on the pool: only this fragment reruns while we wait, then the whole page once
+    @st.fragment(run_every=POLL_SECONDS)
+    def _progress():
+        if not future.done():
+            st.caption(f"⏳ Rendering {file_name}...")
+            return
+        if future.exception() is not None:
+            st.session_state[error_key] = future.exception()
+        st.rerun()
+
+    _progress()
@@ -0,0 +1,76 @@
+import pandas as pd
+
+from fx_rates import BOOK_CURRENCY, convert
+
+# --- Portfolio metrics (no Streamlit) ---
+
+HOLDING_COLUMNS = ["asset_type", "asset_name", "ticker", "investment_amount", "current_value", "sector", "risk_level"]
+
+
+def to_inr(df, currency=BOOK_CURRENCY, rates=None):
+    """New frame of the holdings in INR (dated rate per holding timestamp), with the per-holding 'return (%)' column."""
+    df = convert(df, ['investment_amount', 'current_value'], currency, rates=rates)
+    df['return (%)'] = ((df['current_value'] - df['investment_amount']) / df['investment_amount'] * 100).round(2)
+    return df
+
+
+def summarize_holdings(df):
+    """Headline metrics for one client's (INR) holdings, as shown on the dashboard."""
+    total_investment = df['investment_amount'].sum()
+    total_value = df['current_value'].sum()
+    total_return = round((total_value - total_investment) / total_investment * 100, 2)
+    high_risk_ratio = df['risk_level'].value_counts(normalize=True).get('High', 0)
+    risk_score = (1 - high_risk_ratio) * 100
+    return {
+        "total_investment": total_investment,
+        "total_value": total_value,
+        "total_return": total_return,
+        "top_sector": df.groupby('sector')['current_value'].sum().idxmax(),
+        "high_risk_ratio": high_risk_ratio,
+        "health_score": round((total_return * 0.7 + risk_score * 0.3), 2),
+    }
+
+
+# --- All clients at once ---
+
+class PortfolioMetrics:
+    """Headline metrics, sector allocation and risk mix for every client, from one groupby over the holdings."""
+
+    def __init__(self, df):
+        # The only pass over the holdings: one small (user, sector, risk) cube, everything else is derived from it
+        cube = df.groupby(['user_id', 'sector', 'risk_level'], sort=True).agg(
+            investment_amount=('investment_amount', 'sum'),
+            current_value=('current_value', 'sum'),
+            count=('current_value', 'size'),
+        )
+        self.sectors = cube.groupby(level=['user_id', 'sector'])[['investment_amount', 'current_value']].sum()
+        self.risk_mix = cube.groupby(level=['user_id', 'risk_level'])['count'].sum()
+
+        totals = self.sectors.groupby(level='user_id').sum()
+        holdings = self.risk_mix.groupby(level='user_id').sum()
+        high = self.risk_mix.unstack(fill_value=0).get('High', 0)
+        # idxmax over sectors in sorted order, as groupby('sector')...idxmax() does per client
+        top = self.sectors['current_value'].groupby(level='user_id').idxmax().str[1]
+
+        summary = pd.DataFrame(index=totals.index)
+        summary['total_investment'] = totals['investment_amount']
+        summary['total_value'] = totals['current_value']
+        summary['total_return'] = ((totals['current_value'] - totals['investment_amount'])
+                                   / totals['investment_amount'] * 100).round(2)
+        summary['top_sector'] = top
+        summary['high_risk_ratio'] = high / holdings
+        summary['health_score'] = (summary['total_return'] * 0.7 + (1 - summary['high_risk_ratio']) * 100 * 0.3).round(2)
+        self.summary = summary
+
+    def user_summary(self, user_id):
+        """Same dict as summarize_holdings for that client."""
+        return self.summary.loc[user_id].to_dict()
+
+    def sector_values(self, user_id):
+        """DataFrame [sector, current_value] for the sector bar and pie charts."""
+        return self.sectors.loc[user_id, 'current_value'].reset_index()
+
+    def risk_counts(self, user_id):
+        """DataFrame [risk_level, count], most common first (value_counts order)."""
+        counts = self.risk_mix.loc[user_id].sort_values(ascending=False, kind='stable')
+        return counts.rename_axis('risk_level').reset_index()
@@ -0,0 +1,117 @@
+import hashlib
+import threading
+
+import numpy as np
+import pandas as pd
+
+# --- Portfolio valuation over time (no Streamlit) ---
+#
+# The holdings table is append-only: each row is a holding bought on its
+# timestamp's day and held from then on. Per (client, day) the rows are summed
+# into a cell and the cells are accumulated, so a client's portfolio on a day is
+# every holding bought up to and including it. Cells are kept as flat arrays
+# sorted by (client, day) with per-client offsets (the UserIndex layout), so a
+# client's history is a slice and a daily series over any window is one
+# searchsorted (days without purchases carry the running total forward). New
+# rows are folded in as cells; raw rows are never re-read for aggregation. The
+# rows already folded in are fingerprinted (a row hash is cheap next to loading
+# the table the caller just did), and anything other than a pure append - fewer
+# rows, or any of those rows changed - rebuilds from scratch.
+
+FINGERPRINT_COLUMNS = ["user_id", "timestamp", "investment_amount", "current_value"]
+
+
+def _fingerprint(rows):
+    row_hashes = pd.util.hash_pandas_object(rows[FINGERPRINT_COLUMNS], index=False).to_numpy()
+    return hashlib.blake2b(row_hashes.tobytes(), digest_size=16).digest()
+
+
+class PortfolioHistory:
+    def __init__(self, df=None):
+        self.user_ids = np.array([], dtype=np.int64)
+        self.starts = self.stops = np.array([], dtype=np.int64)
+        self.days = np.array([], dtype="datetime64[D]")
+        self.invested = self.value = np.array([], dtype=float)           # bought that day
+        self.total_invested = self.total_value = np.array([], dtype=float)  # held at the end of that day
+        self.rows_seen = 0
+        self._seen_hash = _fingerprint(pd.DataFrame(columns=FINGERPRINT_COLUMNS))
+        self._lock = threading.Lock()
+        if df is not None:
+            self.sync(df)
+
+    # --- building ---
+    def add(self, rows):
+        """Fold newly arrived holding rows (INR, with 'timestamp') into the snapshot arrays."""
+        cells = pd.DataFrame({
+            "user_id": rows["user_id"].to_numpy(),
+            "day": rows["timestamp"].to_numpy().astype("datetime64[D]"),
+            "invested": rows["investment_amount"].to_numpy(dtype=float),
+            "value": rows["current_value"].to_numpy(dtype=float),
+        })
+        with self._lock:
+            if len(self.days):
+                cells = pd.concat([self._cells(), cells], ignore_index=True)
+            merged = cells.groupby(["user_id", "day"], sort=True)[["invested", "value"]].sum()
+            user = merged.index.get_level_values("user_id").to_numpy()
+            self.days = merged.index.get_level_values("day").to_numpy().astype("datetime64[D]")
+            self.invested = merged["invested"].to_numpy()
+            self.value = merged["value"].to_numpy()
+            totals = merged.groupby(level="user_id").cumsum()
+            self.total_invested = totals["invested"].to_numpy()
+            self.total_value = totals["value"].to_numpy()
+            self.user_ids, self.starts = np.unique(user, return_index=True)
+            self.stops = np.append(self.starts[1:], len(user))
+            self.rows_seen += len(rows)
+
+    def sync(self, df):
+        """Bring the history up to date with df, treating rows past rows_seen as new (append-only table)."""
+        if len(df) < self.rows_seen or _fingerprint(df.iloc[:self.rows_seen]) != self._seen_hash:
+            self.__init__()  # not a pure append: the table was rewritten, start over
+        if len(df) > self.rows_seen:
+            self.add(df.iloc[self.rows_seen:])
+            self._seen_hash = _fingerprint(df.iloc[:self.rows_seen])
+        return self
+
+    def _cells(self):
+        return pd.DataFrame({
+            "user_id": np.repeat(self.user_ids, self.stops - self.starts),
+            "day": self.days,
+            "invested": self.invested,
+            "value": self.value,
+        })
+
+    # --- queries ---
+    def _slice(self, user_id):
+        i = np.searchsorted(self.user_ids, user_id)
+        if i == len(self.user_ids) or self.user_ids[i] != user_id:
+            return slice(0, 0)
+        return slice(self.starts[i], self.stops[i])
+
+    def date_bounds(self, user_id):
+        """(first, last) purchase date for the client, or (None, None)."""
+        days = self.days[self._slice(user_id)]
+        if not len(days):
+            return None, None
+        return pd.Timestamp(days[0]).date(), pd.Timestamp(days[-1]).date()
+
+    def series(self, user_id, start=None, end=None):
+        """Daily [date, investment_amount, current_value, return (%), daily_change (%)] from start to end (inclusive)."""
+        sl = self._slice(user_id)
+        days = self.days[sl]
+        if not len(days):
+            return pd.DataFrame(columns=["date", "investment_amount", "current_value", "return (%)", "daily_change (%)"])
+
+        start = days[0] if start is None else np.datetime64(start, "D")
+        end = days[-1] if end is None else np.datetime64(end, "D")
+        grid = np.arange(start, end + 1, dtype="datetime64[D]")
+
+        idx = np.searchsorted(days, grid, side="right") - 1
+        known = idx >= 0
+        idx = idx.clip(0)
+        invested = np.where(known, self.total_invested[sl][idx], np.nan)
+        value = np.where(known, self.total_value[sl][idx], np.nan)
+
+        out = pd.DataFrame({"date": grid, "investment_amount": invested, "current_value": value})
+        out["return (%)"] = ((value - invested) / invested * 100).round(2)
+        out["daily_change (%)"] = (out["current_value"].pct_change(fill_method=None) * 100).round(2)
+        return out
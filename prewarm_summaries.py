@@ -0,0 +1,121 @@
+"""Pre-compute Final Analysis summaries for every client into the summary cache.
+
+Run overnight so dashboard clicks are served from the cache:
+
+    python prewarm_summaries.py --apps risk portfolio credit personal trend
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from fintalk.credit import credit_stories
+from fintalk.portfolio import PortfolioMetrics, to_inr
+from fintalk.risk import compute_risk_metrics
+from note_store import get_store
+from prompts import (
+    CREDIT_SUMMARY, PERSONAL_ANALYSIS, PORTFOLIO_SUMMARY, RISK_SUMMARY, TREND_SUMMARY,
+    personal_prompt, portfolio_dashboard_text, risk_prompt, trend_prompt, with_advisor_note,
+)
+from report_format import label_value_pairs
+from summary_cache import CACHE_PATH, generate_many
+
+
+# --------------------------------------
+# Per-app prompt builders (mirror what each dashboard shows)
+# --------------------------------------
+def risk_prompts(path):
+    metrics = compute_risk_metrics(pd.read_csv(path, parse_dates=["transaction_time"]))
+    for m in metrics.itertuples():
+        yield m.Index, risk_prompt(m.avg_util, m.avg_ratio, m.over_budget_count, m.income_std, m.volatility_ratio,
+                                   m.suspicious_count, m.low_balance_count, m.alert_types, m.avg_emi_count)
+
+
+def portfolio_prompts(path, notes):
+    metrics = PortfolioMetrics(to_inr(pd.read_csv(path)))
+    for user_id, s in zip(metrics.summary.index, metrics.summary.to_dict("records")):
+        text = portfolio_dashboard_text(
+            user_id, s["total_investment"], s["total_value"], s["total_return"], s["top_sector"],
+            s["high_risk_ratio"], s["health_score"],
+            label_value_pairs(metrics.sector_values(user_id), "sector", "current_value"),
+            label_value_pairs(metrics.risk_counts(user_id), "risk_level", "count"),
+        )
+        yield user_id, with_advisor_note(text, notes.get("portfolio", user_id))
+
+
+def credit_prompts(path, notes):
+    df = pd.read_csv(path)
+    for idx, story in zip(df.index, credit_stories(df)):
+        yield idx, with_advisor_note(story, notes.get("credit", idx))
+
+
+def personal_prompts(path):
+    df = pd.read_csv(path)
+    df.columns = df.columns.str.strip().str.lower().str.replace(" ", "_")
+    yield "all", personal_prompt(df["monthly_income"].mean(), df["monthly_expenses"].mean(),
+                                 df["credit_utilization_(%)"].mean())
+
+
+def trend_prompts(path, threshold=25000):
+    # Default dashboard view: full date range, all categories, default threshold
+    df = pd.read_csv(path)
+    when = pd.to_datetime(df["transaction_date"] + " " + df["transaction_time"])
+    amount = pd.to_numeric(df["amount"], errors="coerce")
+    categories = list(df["transaction_category"].unique())
+    yield "default", trend_prompt(
+        when.dt.date.min(), when.dt.date.max(), categories, len(df),
+        amount[amount > 0].sum(), amount[~(amount > 0)].sum(), (amount.abs() > threshold).sum(),
+    )
+
+
+# --------------------------------------
+# Cache warm-up
+# --------------------------------------
+def prewarm(spec, prompts, cache_path=CACHE_PATH, batch_size=8):
+    task, model, params = spec
+    prompts = [prompt for _, prompt in prompts]
+    _, generated = generate_many(task, model, prompts, params, batch_size, cache_path)
+    return len(prompts), generated
+
+
+APPS = ["risk", "portfolio", "credit", "personal", "trend"]
+
+
+def add_data_args(parser):
+    parser.add_argument("--risk-csv", default="user_risk_features_dataset.csv")
+    parser.add_argument("--portfolio-csv", default="bank_investment_portfolio_dataset.csv")
+    parser.add_argument("--credit-csv", default="credit_data.csv")
+    parser.add_argument("--personal-csv", default="personal_data_dataset.csv")
+    parser.add_argument("--trend-csv", default="trends_dataset.csv")
+    parser.add_argument("--cache", default=CACHE_PATH)
+    parser.add_argument("--batch-size", type=int, default=8)
+
+
+def app_jobs(args):
+    """app name -> (model spec, callable yielding (id, prompt) pairs)"""
+    return {
+        "risk": (RISK_SUMMARY, lambda: risk_prompts(args.risk_csv)),
+        "portfolio": (PORTFOLIO_SUMMARY, lambda: portfolio_prompts(args.portfolio_csv, get_store())),
+        "credit": (CREDIT_SUMMARY, lambda: credit_prompts(args.credit_csv, get_store())),
+        "personal": (PERSONAL_ANALYSIS, lambda: personal_prompts(args.personal_csv)),
+        "trend": (TREND_SUMMARY, lambda: trend_prompts(args.trend_csv)),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--apps", nargs="+", default=APPS, choices=APPS)
+    add_data_args(parser)
+    args = parser.parse_args(argv)
+
+    jobs = app_jobs(args)
+    for app in args.apps:
+        spec, build = jobs[app]
+        start = time.perf_counter()
+        total, generated = prewarm(spec, build(), args.cache, args.batch_size)
+        print(f"{app}: {total} prompts, {generated} generated, {total - generated} already cached "
+              f"({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
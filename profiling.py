@@ -0,0 +1,218 @@
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+# -------------------------------------------------
+# ⏱️ Per-section timing for the dashboards
+# -------------------------------------------------
+# `with section("risk.metrics"):` or `@profiled("credit.chart")` records wall
+# time, CPU time of the running thread and - with FINTALK_PROFILE_MEMORY=1,
+# which turns on tracemalloc - peak traced memory for that section. Records
+# go into a per-process ring buffer (the last FINTALK_PROFILE_RING entries);
+# running totals per section are kept separately so the Prometheus counters
+# stay monotonic. Append ?diagnostics=1 to any app's URL to see them.
+#
+# tracemalloc has one process-wide peak, so a section only gets a peak when no
+# other thread had a section open at any point while it ran; overlapping ones
+# record peak_bytes=None rather than a number that includes the other thread.
+
+ENABLED = os.environ.get("FINTALK_PROFILE", "1") != "0"
+TRACK_MEMORY = os.environ.get("FINTALK_PROFILE_MEMORY") == "1"
+RING_SIZE = int(os.environ.get("FINTALK_PROFILE_RING", "2048"))
+
+_lock = threading.Lock()
+_ring = deque(maxlen=RING_SIZE)
+_totals = {}          # section -> [count, wall seconds, cpu seconds, max peak bytes]
+_local = threading.local()
+_open_roots = set()   # outermost sections currently running, across threads
+
+if TRACK_MEMORY and not tracemalloc.is_tracing():
+    tracemalloc.start()
+
+
+class section:
+    """Context manager timing one named section (nesting is fine; memory peaks propagate to the parent)."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        if not ENABLED:
+            return self
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        if not stack and TRACK_MEMORY:
+            self.shared = False
+            with _lock:
+                if _open_roots:
+                    self.shared = True
+                    for root in _open_roots:
+                        root.shared = True
+                _open_roots.add(self)
+        self.child_peak = 0
+        if TRACK_MEMORY:
+            current, peak_so_far = tracemalloc.get_traced_memory()
+            if stack:
+                # keep the parent's peak from before this section; reset_peak() below drops it
+                stack[-1].child_peak = max(stack[-1].child_peak, peak_so_far)
+            self.mem_start = current
+            tracemalloc.reset_peak()
+        stack.append(self)
+        self.cpu_start = time.thread_time()
+        self.wall_start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not ENABLED:
+            return False
+        wall = time.perf_counter() - self.wall_start
+        cpu = time.thread_time() - self.cpu_start
+        peak = None
+        stack = _local.stack
+        if TRACK_MEMORY:
+            absolute = max(tracemalloc.get_traced_memory()[1], self.child_peak)
+            with _lock:
+                shared = stack[0].shared
+                if len(stack) == 1:
+                    _open_roots.discard(self)
+            if not shared:
+                peak = max(absolute - self.mem_start, 0)
+        stack.pop()
+        if stack and TRACK_MEMORY:
+            parent = stack[-1]
+            parent.child_peak = max(parent.child_peak, absolute)
+            tracemalloc.reset_peak()
+        _record(self.name, wall, cpu, peak, exc_type is None)
+        return False
+
+
+def profiled(name=None):
+    """Decorator form of section(); defaults to the function's qualified name."""
+    def decorate(fn):
+        label = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with section(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _record(name, wall, cpu, peak, ok):
+    with _lock:
+        _ring.append({"section": name, "time": time.time(), "wall_s": wall, "cpu_s": cpu,
+                      "peak_bytes": peak, "ok": ok, "thread": threading.current_thread().name})
+        totals = _totals.setdefault(name, [0, 0.0, 0.0, 0])
+        totals[0] += 1
+        totals[1] += wall
+        totals[2] += cpu
+        if peak is not None and peak > totals[3]:
+            totals[3] = peak
+
+
+def records():
+    """The ring buffer contents, oldest first."""
+    with _lock:
+        return list(_ring)
+
+
+def summary():
+    """Per section over the ring buffer: calls, mean / p95 / max wall ms, mean CPU ms, max peak KiB."""
+    by_section = {}
+    for r in records():
+        by_section.setdefault(r["section"], []).append(r)
+    rows = []
+    for name, rs in sorted(by_section.items()):
+        walls = sorted(r["wall_s"] for r in rs)
+        peaks = [r["peak_bytes"] for r in rs if r["peak_bytes"] is not None]
+        rows.append({
+            "section": name,
+            "calls": len(rs),
+            "mean_wall_ms": sum(walls) / len(walls) * 1000,
+            "p95_wall_ms": walls[min(int(len(walls) * 0.95), len(walls) - 1)] * 1000,
+            "max_wall_ms": walls[-1] * 1000,
+            "mean_cpu_ms": sum(r["cpu_s"] for r in rs) / len(rs) * 1000,
+            "max_peak_kib": max(peaks) / 1024 if peaks else None,
+        })
+    return rows
+
+
+def to_json():
+    return json.dumps({"summary": summary(), "records": records()}, indent=2)
+
+
+def to_prometheus():
+    """Totals since process start, in the Prometheus text exposition format."""
+    with _lock:
+        totals = {name: list(t) for name, t in _totals.items()}
+    lines = [
+        "# HELP fintalk_section_calls_total Profiled section executions.",
+        "# TYPE fintalk_section_calls_total counter",
+        *[f'fintalk_section_calls_total{{section="{n}"}} {t[0]}' for n, t in sorted(totals.items())],
+        "# HELP fintalk_section_wall_seconds_total Wall-clock time spent in the section.",
+        "# TYPE fintalk_section_wall_seconds_total counter",
+        *[f'fintalk_section_wall_seconds_total{{section="{n}"}} {t[1]:.6f}' for n, t in sorted(totals.items())],
+        "# HELP fintalk_section_cpu_seconds_total CPU time (running thread) spent in the section.",
+        "# TYPE fintalk_section_cpu_seconds_total counter",
+        *[f'fintalk_section_cpu_seconds_total{{section="{n}"}} {t[2]:.6f}' for n, t in sorted(totals.items())],
+    ]
+    if TRACK_MEMORY:
+        lines += [
+            "# HELP fintalk_section_peak_bytes Largest traced memory peak seen in the section.",
+            "# TYPE fintalk_section_peak_bytes gauge",
+            *[f'fintalk_section_peak_bytes{{section="{n}"}} {t[3]}' for n, t in sorted(totals.items())],
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def clear():
+    with _lock:
+        _ring.clear()
+        _totals.clear()
+
+
+# -------------------------------------------------
+# 🩺 Hidden diagnostics panel (?diagnostics=1)
+# -------------------------------------------------
+def diagnostics_panel(app):
+    """Render the profiling data (and the other caches' stats) when the URL has ?diagnostics=1."""
+    import streamlit as st
+
+    if st.query_params.get("diagnostics") != "1":
+        return
+
+    import pandas as pd
+    from lazy_imports import load_times
+    from model_registry import model_stats
+    from refresh_scheduler import refresh_stats
+
+    st.markdown("---")
+    st.header(f"🩺 Diagnostics: {app}")
+    if not TRACK_MEMORY:
+        st.caption("Peak memory is only recorded with FINTALK_PROFILE_MEMORY=1.")
+    else:
+        st.caption("Sections that ran alongside another thread's have no peak (tracemalloc's peak is process-wide).")
+
+    st.subheader("Sections (last %d records)" % RING_SIZE)
+    st.dataframe(pd.DataFrame(summary()), use_container_width=True)
+    with st.expander("Recent records"):
+        st.dataframe(pd.DataFrame(records()[-200:][::-1]), use_container_width=True)
+
+    col1, col2, col3 = st.columns(3)
+    col1.download_button("⬇️ JSON", data=to_json(), file_name=f"{app}_profile.json", mime="application/json")
+    col2.download_button("⬇️ Prometheus", data=to_prometheus(), file_name=f"{app}_metrics.prom", mime="text/plain")
+    if col3.button("🧹 Clear"):
+        clear()
+
+    st.subheader("Refresh scheduler")
+    st.json(refresh_stats())
+    st.subheader("Models loaded")
+    st.json(model_stats())
+    st.subheader("Lazy imports (ms on first use)")
+    st.json(load_times())
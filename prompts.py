@@ -0,0 +1,68 @@
+# --------------------------------------
+# 📝 Final Analysis prompt builders
+# --------------------------------------
+# The apps and the offline pre-warm job both build their "Final Analysis"
+# prompts here, so the exact same text (and therefore the same cache key)
+# comes out of a button click and an overnight batch run.
+
+from model_registry import SUMMARY_MODEL, FAST_SUMMARY_MODEL, TEXT_MODEL
+
+# (task, model, generation kwargs) used by each app's Final Analysis button
+RISK_SUMMARY = ("summarization", SUMMARY_MODEL, {"max_length": 250, "min_length": 80, "do_sample": False})
+TREND_SUMMARY = ("summarization", SUMMARY_MODEL, {"max_length": 130, "min_length": 30, "do_sample": False})
+PORTFOLIO_SUMMARY = ("summarization", FAST_SUMMARY_MODEL, {"max_length": 150, "min_length": 50, "do_sample": False})
+CREDIT_SUMMARY = ("summarization", FAST_SUMMARY_MODEL, {"max_length": 150, "min_length": 50, "do_sample": False})
+PERSONAL_ANALYSIS = ("text-generation", TEXT_MODEL, {"max_length": 300})
+
+
+def risk_prompt(avg_util, avg_ratio, over_budget_count, income_std, volatility_ratio,
+                suspicious_count, low_balance_count, alert_types, avg_emi_count):
+    return f"""
+Credit Utilization: {avg_util:.2f}%. Repayment Ratio: {avg_ratio*100:.2f}%. Over-budget grocery txns: {over_budget_count}.
+Income Std Dev: {income_std:.2f}, Volatility Ratio: {volatility_ratio:.2f}.
+Suspicious Transactions: {suspicious_count}. Low Balance Records: {low_balance_count}.
+Security Alerts: {alert_types}. Avg EMI Count: {avg_emi_count:.1f}.
+"""
+
+
+def trend_prompt(start_date, end_date, categories, transaction_count, total_income, total_expense, anomaly_count):
+    return f"""
+        Financial Trend Analysis Summary:
+        - Date Range: {start_date} to {end_date}
+        - Selected Categories: {', '.join(categories)}
+        - Total Transactions: {transaction_count}
+        - Total Income: Rs.{total_income:,.2f}
+        - Total Expense: Rs.{total_expense:,.2f}
+        - Anomalies Detected: {anomaly_count}
+        """
+
+
+def portfolio_dashboard_text(user_id, total_investment, total_value, total_return, top_sector,
+                             high_risk_ratio, health_score, sector_values, risk_counts):
+    """sector_values / risk_counts are (label, value) pairs in display order."""
+    dashboard_text = f"""
+Client ID: {user_id}
+Total Investment: ₹{total_investment:,.0f}
+Current Value: ₹{total_value:,.0f}
+Net Return: {total_return}%
+Top Sector: {top_sector}
+High Risk Ratio: {high_risk_ratio:.2f}
+Portfolio Health Score: {health_score}/100
+"""
+    sector_data = ", ".join(f"{sector} ({int(value)} ₹)" for sector, value in sector_values)
+    dashboard_text += f"\nSector Allocation: {sector_data}"
+
+    risk_data = ", ".join(f"{level} ({count})" for level, count in risk_counts)
+    dashboard_text += f"\nRisk Levels: {risk_data}"
+    return dashboard_text
+
+
+def personal_prompt(income, expenses, avg_util):
+    return f"Financial Summary: Avg Monthly Income: ₹{income:.2f}, " \
+           f"Avg Monthly Expenses: ₹{expenses:.2f}, " \
+           f"Net Savings: ₹{income - expenses:.2f}, " \
+           f"Avg Credit Utilization: {avg_util:.2f}%."
+
+
+def with_advisor_note(text, note):
+    return f"{text}\n\nAdvisor Note: {note}"
@@ -0,0 +1,151 @@
+import hashlib
+import os
+import threading
+import time
+from collections import defaultdict
+
+from data_access import DATASETS, data_version
+
+# -------------------------------------------------
+# 🔄 Shared refresh scheduler for the dashboards
+# -------------------------------------------------
+# Each session gets exactly one timer (a Streamlit fragment with run_every),
+# no background threads. On every tick the fragment fingerprints the page's
+# data files by content (the hash is only recomputed when a file's mtime or
+# size moved, once per process; a file that only grew - the append-only trend
+# feed - has just its new bytes hashed), so a touch or an identical rewrite
+# doesn't count. The full page reruns only when the data really changed; otherwise the
+# tick is counted as skipped. Counters are per process, see refresh_stats().
+
+REFRESH_SECONDS = int(os.environ.get("FINTALK_REFRESH_SECONDS", "600"))
+
+_lock = threading.Lock()
+_sessions = {}                     # session id -> (app, interval, last tick)
+_counts = defaultdict(lambda: {"ticks": 0, "refreshes": 0, "skipped": 0})
+_hashes = {}                       # path -> _Hashed of its last seen version
+SAMPLE_BYTES = 1 << 16             # head / tail kept to tell an append from a rewrite
+
+
+class _Hashed:
+    __slots__ = ("mtime_ns", "size", "inode", "digest", "state", "head", "tail")
+
+
+def _path(source):
+    return data_version(source)[0] if source in DATASETS else source
+
+
+def _appended_to(f, cached, info):
+    """True when the file is cached's file with bytes added at the end (same inode, head and old tail)."""
+    if info.st_ino != cached.inode or info.st_size <= cached.size:
+        return False
+    if f.read(len(cached.head)) != cached.head:
+        return False
+    f.seek(cached.size - len(cached.tail))
+    return f.read(len(cached.tail)) == cached.tail
+
+
+def _file_hash(path, info):
+    """sha256 of the file, computed once per (mtime, size) version and process; appends only hash the new bytes."""
+    with _lock:
+        cached = _hashes.get(path)
+    if cached and (cached.mtime_ns, cached.size) == (info.st_mtime_ns, info.st_size):
+        return cached.digest
+    entry = _Hashed()
+    with open(path, "rb") as f:
+        if cached and _appended_to(f, cached, info):
+            h, start = cached.state.copy(), cached.size
+        else:
+            h, start = hashlib.sha256(), 0
+        f.seek(start)
+        size = start
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+            size += len(chunk)
+        f.seek(0)
+        entry.head = f.read(SAMPLE_BYTES)
+        f.seek(max(size - SAMPLE_BYTES, 0))
+        entry.tail = f.read(SAMPLE_BYTES)
+    # size is what was hashed (the file may have grown meanwhile; the next tick picks that up)
+    entry.mtime_ns, entry.size, entry.inode = info.st_mtime_ns, size, info.st_ino
+    entry.digest, entry.state = h.hexdigest(), h
+    with _lock:
+        _hashes[path] = entry
+    return entry.digest
+
+
+def fingerprint(sources):
+    """{path: (size, sha256)} for a page's data sources (dataset names or file paths).
+
+    Only a stat per file unless the file changed since it was last hashed.
+    """
+    out = {}
+    for source in sources:
+        path = _path(source)
+        try:
+            info = os.stat(path)
+        except FileNotFoundError:
+            out[path] = None
+            continue
+        out[path] = (info.st_size, _file_hash(path, info))
+    return out
+
+
+def changed(old, new):
+    """True when any source was added, removed or differs in content (a touch alone doesn't count)."""
+    return old != new
+
+
+def _session_id():
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+        return ctx.session_id if ctx else None
+    except Exception:
+        return None
+
+
+def _tally(app, interval, *events):
+    sid = _session_id()
+    with _lock:
+        if sid is not None:
+            _sessions[sid] = (app, interval, time.time())
+        for event in events:
+            _counts[app][event] += 1
+
+
+def refresh_stats():
+    """Per app: active timers (sessions that ticked recently), ticks, refreshes and skipped refreshes."""
+    now = time.time()
+    with _lock:
+        for sid, (_, interval, seen) in list(_sessions.items()):
+            if now - seen > 2 * interval + 60:
+                del _sessions[sid]  # session closed (or its tab is gone)
+        active = defaultdict(int)
+        for app, _, _ in _sessions.values():
+            active[app] += 1
+        return {app: dict(_counts[app], active_timers=active[app]) for app in sorted(set(_counts) | set(active))}
+
+
+def auto_refresh(app, sources, interval=REFRESH_SECONDS):
+    """Rerun the page when any of sources changes, checking once per interval seconds."""
+    import streamlit as st
+
+    key = f"_refresh_{app}"
+    # A full run has just (re)loaded the data: that is the baseline the timer compares against
+    st.session_state[key] = fingerprint(sources)
+    st.session_state[f"{key}_full_run"] = True
+    _tally(app, interval)
+
+    @st.fragment(run_every=interval)
+    def _timer():
+        if st.session_state.pop(f"{key}_full_run", False):
+            return  # rendered as part of the page run, not a tick
+        current = fingerprint(sources)
+        if not changed(st.session_state[key], current):
+            st.session_state[key] = current
+            _tally(app, interval, "ticks", "skipped")
+            return
+        _tally(app, interval, "ticks", "refreshes")
+        st.rerun()
+
+    _timer()
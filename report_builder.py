@@ -0,0 +1,198 @@
+import re
+from io import BytesIO
+
+from lazy_imports import lazy
+from report_format import outlier_lines, portfolio_detail_lines
+
+# PDF libraries are only imported once a report is actually rendered
+fpdf = lazy("fpdf")
+canvas = lazy("reportlab.pdfgen.canvas")
+pagesizes = lazy("reportlab.lib.pagesizes")
+
+# -------------------------------------------------
+# PDF report builders (no Streamlit, no globals)
+# -------------------------------------------------
+# Each builder takes one client's metrics and returns the PDF bytes, so the
+# dashboards and the bulk exporter render identical reports.
+
+# (section title, [(label format, metric key, scale)]) in report order
+RISK_SECTIONS = [
+    ("Credit Utilization Risk", [("Average Utilization: {:.2f}%", "avg_util", 1)]),
+    ("Loan Repayment Risk", [("Repayment-to-Income Ratio: {:.2f}%", "avg_ratio", 100)]),
+    ("Over-Budget Spending Risk", [("Over-budget Transactions: {}", "over_budget_count", None)]),
+    ("Income Volatility Risk", [("Income Std Dev: {:.2f}", "income_std", 1),
+                                ("Volatility Ratio: {:.2f}", "volatility_ratio", 1)]),
+    ("Fraud & Anomaly Risk", [("Suspicious Transactions: {}", "suspicious_count", None)]),
+    ("Account Balance Risk", [("Low Balance Records: {}", "low_balance_count", None)]),
+    ("Security Alert Monitoring", [("Unique Alerts: {}", "alert_types", None)]),
+    ("EMI Load Risk", [("Average EMI Count: {:.1f}", "avg_emi_count", 1)]),
+]
+
+
+def render_risk_pdf(user_id, metrics, note=""):
+    """metrics: a row of risk_engine.compute_risk_metrics (Series or dict)."""
+    pdf = fpdf.FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", size=12)
+
+    pdf.cell(200, 10, txt=f"FinTalk Pro: Risk Report for User #{user_id}", ln=True, align="C")
+    pdf.ln(10)
+
+    for title, lines in RISK_SECTIONS:
+        pdf.set_font("Arial", "B", size=12)
+        pdf.cell(0, 10, title, ln=True)
+        pdf.set_font("Arial", size=12)
+        for label, key, scale in lines:
+            value = metrics[key] if scale is None else metrics[key] * scale
+            pdf.cell(0, 10, label.format(value), ln=True)
+        pdf.ln(5)
+
+    pdf.set_font("Arial", "B", size=12)
+    pdf.cell(0, 10, "Advisor Note", ln=True)
+    pdf.set_font("Arial", size=12)
+    pdf.multi_cell(0, 10, note if note else "No advisor note saved.")
+    pdf.ln(5)
+
+    return pdf.output(dest="S").encode("latin1")
+
+
+def render_portfolio_pdf(user_id, summary, holdings, note=None):
+    """summary: portfolio_engine.summarize_holdings output; holdings: the client's INR holdings."""
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=pagesizes.letter)
+    width, height = pagesizes.letter
+
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(200, height - 50, "FinTalk Portfolio Report")
+
+    c.setFont("Helvetica", 12)
+    y = height - 100
+    c.drawString(50, y, f"Client ID: {user_id}")
+    y -= 20
+    c.drawString(50, y, f"Total Investment (Rs.): {summary['total_investment']:,.0f}")
+    y -= 20
+    c.drawString(50, y, f"Current Value (Rs.): {summary['total_value']:,.0f}")
+    y -= 20
+    c.drawString(50, y, f"Net Return (%): {summary['total_return']}%")
+    y -= 20
+    c.drawString(50, y, f"Top Sector: {summary['top_sector']}")
+    y -= 20
+    c.drawString(50, y, f"Health Score: {summary['health_score']}/100")
+    y -= 40
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(50, y, "Portfolio Details")
+    y -= 20
+    c.setFont("Helvetica", 9)
+
+    for text in portfolio_detail_lines(holdings):
+        if y < 60:
+            c.showPage()
+            y = height - 50
+        c.drawString(50, y, text)
+        y -= 15
+
+    # Add advisor note if one is saved
+    if note is not None:
+        c.setFont("Helvetica-Bold", 12)
+        y -= 30
+        c.drawString(50, y, "Advisor Note:")
+        y -= 15
+        c.setFont("Helvetica", 10)
+        for line in note.splitlines():
+            if y < 60:
+                c.showPage()
+                y = height - 50
+            c.drawString(60, y, line)
+            y -= 15
+
+    c.save()
+    return buffer.getvalue()
+
+
+# Emoji ranges fpdf's core fonts can't encode
+_EMOJI = re.compile(
+    "["
+    "\U0001F600-\U0001F64F"
+    "\U0001F300-\U0001F5FF"
+    "\U0001F680-\U0001F6FF"
+    "\U0001F1E0-\U0001F1FF"
+    "\U00002700-\U000027BF"
+    "\U000024C2-\U0001F251"
+    "\U0001F900-\U0001F9FF"
+    "]+"
+)
+
+
+def pdf_safe_text(text):
+    """Text with emoji stripped and ₹ / en dashes spelled out for the latin-1 PDF fonts."""
+    return _EMOJI.sub("", text).replace("₹", "Rs.").replace("–", "-")
+
+
+def _text_pdf(text):
+    pdf = fpdf.FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", size=12)
+    for line in pdf_safe_text(text).split("\n"):
+        pdf.multi_cell(0, 10, line)
+    return pdf.output(dest="S").encode("latin-1", errors="replace")
+
+
+def render_personal_pdf(report_text):
+    """report_text: fintalk.personal.report_text output."""
+    return _text_pdf(report_text)
+
+
+def render_credit_pdf(insight_text, note=""):
+    """insight_text: the profile's credit story; the advisor note is appended when there is one."""
+    text = insight_text.strip()
+    if note.strip():
+        text += f"\n\n---\n\n📌 Advisor Notes:\n{note.strip()}"
+    return _text_pdf(text)
+
+
+def render_trend_pdf(start_date, end_date, categories, threshold, outliers, note=""):
+    """outliers: the transactions over the anomaly threshold (the first 20 are listed)."""
+    buffer = BytesIO()
+    p = canvas.Canvas(buffer, pagesize=pagesizes.letter)
+    width, height = pagesizes.letter
+    y = height - 40
+
+    p.setFont("Helvetica-Bold", 14)
+    p.drawString(40, y, "FinTalk Pro: Financial Trend Analysis")
+    y -= 30
+
+    p.setFont("Helvetica", 11)
+    p.drawString(40, y, f"Selected Date Range: {start_date} to {end_date}")
+    y -= 20
+    p.drawString(40, y, f"Selected Categories: {', '.join(categories)}")
+    y -= 30
+
+    if note.strip():
+        p.setFont("Helvetica-Bold", 12)
+        p.drawString(40, y, "Advisor Note:")
+        y -= 20
+        p.setFont("Helvetica", 11)
+        for line in note.splitlines():
+            p.drawString(50, y, line)
+            y -= 15
+            if y < 50:
+                p.showPage()
+                y = height - 40
+        y -= 10
+
+    p.setFont("Helvetica-Bold", 12)
+    p.drawString(40, y, f"Anomaly Threshold: {threshold}")
+    y -= 20
+    p.setFont("Helvetica", 11)
+    p.drawString(40, y, f"Anomalies Detected: {len(outliers)}")
+    y -= 30
+
+    for txt in outlier_lines(outliers.head(20)):
+        p.drawString(50, y, txt)
+        y -= 15
+        if y < 50:
+            p.showPage()
+            y = height - 40
+
+    p.save()
+    return buffer.getvalue()
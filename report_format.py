@@ -0,0 +1,38 @@
+import numpy as np
+
+# -------------------------------------------------
+# Vectorized text formatting for dashboards and PDF reports
+# -------------------------------------------------
+# Column-wise replacements for the per-row lambdas / iterrows() loops the
+# pages used to run; each returns the same text the row loop produced.
+
+
+def transaction_type(amount):
+    """'Income' for positive amounts, 'Expense' otherwise (including NaN)."""
+    return np.where(np.asarray(amount, dtype=float) > 0, "Income", "Expense")
+
+
+def label_value_pairs(df, label_col, value_col):
+    return list(zip(df[label_col].tolist(), df[value_col].tolist()))
+
+
+def portfolio_detail_lines(df):
+    """One 'asset | name (ticker) | Rs.invested ➡ Rs.current | sector | risk' line per holding."""
+    lines = (
+        df["asset_type"].astype(str) + " | " + df["asset_name"].astype(str)
+        + " (" + df["ticker"].astype(str) + ") | Rs."
+        + df["investment_amount"].astype("int64").astype(str) + " ➡ Rs."
+        + df["current_value"].astype("int64").astype(str) + " | "
+        + df["sector"].astype(str) + " | " + df["risk_level"].astype(str)
+    )
+    return lines.tolist()
+
+
+def outlier_lines(outliers):
+    """One 'datetime | merchant | Rs.amount | category' line per flagged transaction."""
+    # Timestamp.__str__, as the row loop printed it (astype(str) trims sub-second zeros: .755 vs .755000)
+    lines = (
+        outliers["transaction_datetime"].map(str) + " | " + outliers["merchant"].astype(str)
+        + " | Rs." + outliers["amount"].map(str) + " | " + outliers["transaction_category"].astype(str)
+    )
+    return lines.tolist()
@@ -1,41 +1,68 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import os
-import json
-from fpdf import FPDF
-from transformers import pipeline  # ✅ NEW
+from data_access import UserIndex, data_version, load_dataset
+from fintalk import risk
+from note_store import get_store
+from pdf_cache import content_hash, download_when_ready
+from report_builder import render_risk_pdf
+from profiling import diagnostics_panel, profiled, section
+from prompts import RISK_SUMMARY, risk_prompt
+from refresh_scheduler import auto_refresh
+from summary_cache import cached_generate
 
 # -----------------------------
 # Page Config
 # -----------------------------
 st.set_page_config(page_title="FinTalk Risk Analyzer", layout="wide")
 
+# Auto refresh: checked every 600 seconds, reruns only when the data changed
+auto_refresh("risk", ["risk"])
+
 # -----------------------------
 # Load Dataset
 # -----------------------------
-DATA_PATH = r"D:\FinTalk Pro\Risk detection\user_risk_features_dataset.csv"
-
-@st.cache_data
-def load_data():
-    df = pd.read_csv(DATA_PATH, parse_dates=["transaction_time"])
-    return df[df["user_id"] == 1017]  # Filter for single user
-
-df = load_data()
+DEFAULT_USER_ID = 1017
+
+# Read-only, shared across sessions: rows sorted by user once, so switching clients is a slice.
+# Everything is keyed by the data file version, so a changed file is picked up on the next run (only the latest version is kept).
+@st.cache_resource(max_entries=1)
+@profiled("risk.user_index")
+def get_user_index(version):
+    return UserIndex(load_dataset("risk"))
+
+@st.cache_resource(max_entries=1)
+@profiled("risk.metrics")
+def load_risk_metrics(version):
+    return risk.compute_risk_metrics(get_user_index(version).frame)
+
+@st.cache_resource(max_entries=1)
+@profiled("risk.anomaly_scores")
+def load_anomaly_scores(version):
+    # Replays every transaction in time order through the rolling per-user / per-category detector
+    return risk.anomaly_scores(get_user_index(version).frame)
+
+version = data_version("risk")
+user_index = get_user_index(version)
+user_ids = user_index.user_ids.tolist()
+user_id = st.sidebar.selectbox("👤 Client", user_ids,
+                               index=user_ids.index(DEFAULT_USER_ID) if DEFAULT_USER_ID in user_index else 0)
+
+with section("risk.select_user"):
+    df = user_index.rows(user_id)
+    metrics = load_risk_metrics(version).loc[user_id]
+    flags = risk.risk_flags(metrics)
 
 st.title("🔍 FinTalk Pro: Risk Analyzer")
-st.markdown("Personalized risk insights for user **#1017**")
+st.markdown(f"Personalized risk insights for user **#{user_id}**")
 
 # -----------------------------
 # 1. Credit Utilization Risk
 # -----------------------------
 st.header("💳 Credit Utilization Risk")
-avg_util = df["credit_utilization_percent"].mean()
+avg_util = metrics["avg_util"]
 st.progress(min(avg_util / 100, 1.0))
 st.metric("Avg Credit Utilization", f"{avg_util:.2f} %")
 
-if avg_util > 30:
+if flags["high_utilization"]:
     st.warning("⚠️ High credit utilization. Try to keep it under 30%.")
     st.markdown("💡 _Tip: Pay down your balance or request a credit limit increase._")
 else:
@@ -45,12 +72,11 @@ else:
 # 2. Loan Repayment Risk
 # -----------------------------
 st.header("📉 Loan Repayment Risk")
-df["repayment_ratio"] = df["monthly_loan_payment"] / df["monthly_income"]
-avg_ratio = df["repayment_ratio"].mean()
+avg_ratio = metrics["avg_ratio"]
 
 st.metric("Repayment-to-Income Ratio", f"{avg_ratio*100:.2f} %")
 
-if avg_ratio > 0.4:
+if flags["high_repayment_burden"]:
     st.error("🚨 High loan repayment burden!")
 else:
     st.success("✅ Loan repayment burden is manageable.")
@@ -59,10 +85,9 @@ else:
 # 3. Over-Budget Spending Risk
 # -----------------------------
 st.header("🛒 Over-Budget Spending Risk")
-df["over_budget"] = df["groceries_spent"] > df["groceries_budget"]
-over_budget_count = df["over_budget"].sum()
+over_budget_count = metrics["over_budget_count"]
 
-if over_budget_count > 0:
+if flags["over_budget"]:
     st.warning(f"⚠️ You exceeded your groceries budget in {over_budget_count} out of {len(df)} transactions.")
     st.bar_chart(df[["groceries_budget", "groceries_spent"]])
 else:
@@ -72,14 +97,12 @@ else:
 # 4. Income Volatility Risk
 # -----------------------------
 st.header("📈 Income Volatility Risk")
-income_std = df["monthly_income"].std()
-income_mean = df["monthly_income"].mean()
-
-volatility_ratio = income_std / income_mean
+income_std = metrics["income_std"]
+volatility_ratio = metrics["volatility_ratio"]
 st.metric("Income Std Dev", f"{income_std:.2f}")
 st.line_chart(df[["monthly_income"]])
 
-if volatility_ratio > 0.25:
+if flags["volatile_income"]:
     st.warning("⚠️ Your income is highly variable.")
     st.markdown("💡 _Tip: Consider building a financial buffer._")
 else:
@@ -89,24 +112,31 @@ else:
 # 5. Transaction Anomalies / Fraud Risk
 # -----------------------------
 st.header("🔍 Fraud & Anomaly Risk")
-anomaly_df = df[df["is_large"] | df["is_foreign"] | df["is_unusual_time"]]
+with section("risk.suspicious"):
+    anomaly_df = risk.suspicious_transactions(df)
+suspicious_count = metrics["suspicious_count"]
 
-if not anomaly_df.empty:
-    st.error(f"🚨 {len(anomaly_df)} suspicious transactions detected!")
+if flags["suspicious_transactions"]:
+    st.error(f"🚨 {suspicious_count} suspicious transactions detected!")
     st.dataframe(anomaly_df[["transaction_time", "transaction_amount", "merchant", "is_large", "is_foreign", "is_unusual_time"]])
     st.markdown("🛡️ _Please review and mark transactions as safe or report._")
 else:
     st.success("✅ No suspicious transactions detected.")
 
+with section("risk.stat_outliers"):
+    stat_outliers = risk.stat_outliers(df, load_anomaly_scores(version))
+if not stat_outliers.empty:
+    st.warning(f"📐 {len(stat_outliers)} transactions are statistical outliers for this user or their category.")
+    st.dataframe(stat_outliers[["transaction_time", "transaction_amount", "merchant", "transaction_category", "anomaly_score"]])
+
 # -----------------------------
 # 6. Account Balance Risk
 # -----------------------------
 st.header("🏦 Account Balance Risk")
-avg_expense = df["monthly_expenses"].mean()
-low_balance_df = df[df["account_balance"] < avg_expense]
+low_balance_count = metrics["low_balance_count"]
 
-if not low_balance_df.empty:
-    st.warning(f"⚠️ Low balance detected in {len(low_balance_df)} records. You may not cover monthly expenses.")
+if flags["low_balance"]:
+    st.warning(f"⚠️ Low balance detected in {low_balance_count} records. You may not cover monthly expenses.")
 else:
     st.success("✅ Account balance is generally sufficient.")
 
@@ -114,10 +144,10 @@ else:
 # 7. Security Alert Monitoring
 # -----------------------------
 st.header("🔐 Security Alerts")
-alerts = df[df["security_alert_type"].notnull()]
+alerts = risk.security_alerts(df)
 
 if not alerts.empty:
-    st.error(f"🚨 Security alerts found: {alerts['security_alert_type'].nunique()} types")
+    st.error(f"🚨 Security alerts found: {metrics['alert_types']} types")
     st.dataframe(alerts[["transaction_time", "merchant", "security_alert_type"]])
     st.markdown("🔑 _Please follow up with appropriate security measures (e.g., password reset)._")
 else:
@@ -127,9 +157,9 @@ else:
 # 8. EMI Clustering Risk
 # -----------------------------
 st.header("📆 EMI Load Risk")
-avg_emi_count = df["emi_count"].mean()
+avg_emi_count = metrics["avg_emi_count"]
 
-if avg_emi_count > 5:
+if flags["emi_overload"]:
     st.error(f"🚨 You have {avg_emi_count:.1f} EMIs on average – high risk of overload.")
 else:
     st.success(f"✅ EMI load is within a healthy range: {avg_emi_count:.1f}")
@@ -138,13 +168,11 @@ else:
 # Option 6: High-Risk Transaction Days
 # -----------------------------
 st.header("📅 High-Risk Transaction Days")
-df["date_only"] = df["transaction_time"].dt.date
-daily_anomalies = df[df["is_large"] | df["is_foreign"] | df["is_unusual_time"]].groupby("date_only").size()
-high_risk_days = daily_anomalies[daily_anomalies > 2]
-
-if not high_risk_days.empty:
+if flags["high_risk_days"]:
+    with section("risk.high_risk_days"):
+        high_risk_days = risk.high_risk_days(df)
     st.error("🚨 Days with multiple suspicious transactions detected:")
-    st.dataframe(high_risk_days.rename("Suspicious Txns").reset_index())
+    st.dataframe(high_risk_days)
 else:
     st.success("✅ No high-risk days found.")
 
@@ -153,18 +181,7 @@ else:
 # -----------------------------
 st.header("🤖 Smart Bank Recommendations")
 
-recommendations = []
-
-if avg_util > 30:
-    recommendations.append("🔄 Consider lowering your credit utilization below 30%.")
-if avg_ratio > 0.4:
-    recommendations.append("💡 Re-evaluate your loan structure or seek financial counseling.")
-if volatility_ratio > 0.25:
-    recommendations.append("📉 Set up an emergency fund due to income fluctuations.")
-if len(low_balance_df) > 5:
-    recommendations.append("🏦 Maintain a minimum balance to avoid penalties.")
-if avg_emi_count > 5:
-    recommendations.append("📆 Too many EMIs – consolidate loans if possible.")
+recommendations = metrics["recommendations"]
 
 if not recommendations:
     st.success("✅ Your financial profile looks healthy. Keep it up!")
@@ -175,14 +192,11 @@ else:
 # -----------------------------
 # Advisor Note Section
 # -----------------------------
-NOTE_FILE = "advisor_note.json"
+NOTE_APP = "risk"
+notes = get_store()
 
-# Load saved note if exists
-if os.path.exists(NOTE_FILE):
-    with open(NOTE_FILE, "r") as f:
-        saved_note = json.load(f).get("note", "")
-else:
-    saved_note = ""
+# Load the selected client's saved note
+saved_note = notes.get(NOTE_APP, user_id)
 
 st.header("📝 Advisor Note")
 note = st.text_area("Enter your personalized note/advice here:", value=saved_note, height=150)
@@ -190,14 +204,12 @@ note = st.text_area("Enter your personalized note/advice here:", value=saved_not
 col1, col2 = st.columns([1, 1])
 with col1:
     if st.button("💾 Save Note"):
-        with open(NOTE_FILE, "w") as f:
-            json.dump({"note": note}, f)
+        notes.set(NOTE_APP, user_id, note)
         st.success("Note saved successfully!")
 
 with col2:
     if st.button("🗑️ Clear Note"):
-        if os.path.exists(NOTE_FILE):
-            os.remove(NOTE_FILE)
+        notes.delete(NOTE_APP, user_id)
         note = ""
         st.success("Note cleared!")
 
@@ -206,72 +218,9 @@ with col2:
 # -----------------------------
 st.header("📄 Download Risk Report")
 
-def generate_pdf():
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial", size=12)
-
-    pdf.cell(200, 10, txt="FinTalk Pro: Risk Report for User #1017", ln=True, align="C")
-    pdf.ln(10)
-
-    pdf.set_font("Arial", "B", size=12)
-    pdf.cell(0, 10, "Credit Utilization Risk", ln=True)
-    pdf.set_font("Arial", size=12)
-    pdf.cell(0, 10, f"Average Utilization: {avg_util:.2f}%", ln=True)
-    pdf.ln(5)
-
-    pdf.set_font("Arial", "B", size=12)
-    pdf.cell(0, 10, "Loan Repayment Risk", ln=True)
-    pdf.set_font("Arial", size=12)
-    pdf.cell(0, 10, f"Repayment-to-Income Ratio: {avg_ratio*100:.2f}%", ln=True)
-    pdf.ln(5)
-
-    pdf.set_font("Arial", "B", size=12)
-    pdf.cell(0, 10, "Over-Budget Spending Risk", ln=True)
-    pdf.set_font("Arial", size=12)
-    pdf.cell(0, 10, f"Over-budget Transactions: {over_budget_count}", ln=True)
-    pdf.ln(5)
-
-    pdf.set_font("Arial", "B", size=12)
-    pdf.cell(0, 10, "Income Volatility Risk", ln=True)
-    pdf.set_font("Arial", size=12)
-    pdf.cell(0, 10, f"Income Std Dev: {income_std:.2f}", ln=True)
-    pdf.cell(0, 10, f"Volatility Ratio: {volatility_ratio:.2f}", ln=True)
-    pdf.ln(5)
-
-    pdf.set_font("Arial", "B", size=12)
-    pdf.cell(0, 10, "Fraud & Anomaly Risk", ln=True)
-    pdf.set_font("Arial", size=12)
-    pdf.cell(0, 10, f"Suspicious Transactions: {len(anomaly_df)}", ln=True)
-    pdf.ln(5)
-
-    pdf.set_font("Arial", "B", size=12)
-    pdf.cell(0, 10, "Account Balance Risk", ln=True)
-    pdf.set_font("Arial", size=12)
-    pdf.cell(0, 10, f"Low Balance Records: {len(low_balance_df)}", ln=True)
-    pdf.ln(5)
-
-    pdf.set_font("Arial", "B", size=12)
-    pdf.cell(0, 10, "Security Alert Monitoring", ln=True)
-    pdf.set_font("Arial", size=12)
-    pdf.cell(0, 10, f"Unique Alerts: {alerts['security_alert_type'].nunique() if not alerts.empty else 0}", ln=True)
-    pdf.ln(5)
-
-    pdf.set_font("Arial", "B", size=12)
-    pdf.cell(0, 10, "EMI Load Risk", ln=True)
-    pdf.set_font("Arial", size=12)
-    pdf.cell(0, 10, f"Average EMI Count: {avg_emi_count:.1f}", ln=True)
-    pdf.ln(5)
-
-    pdf.set_font("Arial", "B", size=12)
-    pdf.cell(0, 10, "Advisor Note", ln=True)
-    pdf.set_font("Arial", size=12)
-    pdf.multi_cell(0, 10, note if note else "No advisor note saved.")
-    pdf.ln(5)
-
-    return pdf.output(dest="S").encode("latin1")
-
-st.download_button("📥 Download PDF Report", data=generate_pdf(), file_name="risk_report_user_1017.pdf", mime="application/pdf")
+# Rendered only on request, in the background, and cached by metrics + note
+download_when_ready("📥 Download PDF Report", content_hash("risk", user_id, metrics.to_dict(), note),
+                    render_risk_pdf, user_id, metrics.to_dict(), note, file_name=f"risk_report_user_{user_id}.pdf")
 
 # -----------------------------
 # Final Transformer-based Analysis Summary (UPDATED)
@@ -279,36 +228,26 @@ st.download_button("📥 Download PDF Report", data=generate_pdf(), file_name="r
 st.header("🔍 See AI Full Analysis")
 st.write("Click the button below to generate an in-depth financial analysis based on your data.")
 
-@st.cache_resource
-def get_summary_model():
-    return pipeline("summarization", model="facebook/bart-large-cnn")
-
-summarizer = get_summary_model()
-
-summary_input = f"""
-Credit Utilization: {avg_util:.2f}%. Repayment Ratio: {avg_ratio*100:.2f}%. Over-budget grocery txns: {over_budget_count}. 
-Income Std Dev: {income_std:.2f}, Volatility Ratio: {volatility_ratio:.2f}. 
-Suspicious Transactions: {len(anomaly_df)}. Low Balance Records: {len(low_balance_df)}. 
-Security Alerts: {alerts['security_alert_type'].nunique() if not alerts.empty else 0}. Avg EMI Count: {avg_emi_count:.1f}.
-"""
+summary_input = risk_prompt(
+    avg_util, avg_ratio, over_budget_count, income_std, volatility_ratio, suspicious_count, low_balance_count,
+    metrics["alert_types"], avg_emi_count,
+)
 
 if st.button("Final Analysis"):
     with st.spinner("Generating AI summary..."):
-        summary = summarizer(summary_input, max_length=250, min_length=80, do_sample=False)[0]['summary_text']
+        task, model_name, params = RISK_SUMMARY
+        with section("risk.final_analysis"):
+            summary = cached_generate(task, model_name, summary_input, params)
         st.markdown(
             f"<div style='background-color: rgba(255, 255, 255, 0); padding: 15px; border-radius: 10px;'>"
             f"<p style='color: white; font-size: 16px;'>{summary}</p></div>",
             unsafe_allow_html=True
         )
 
-# -----------------------------
-# Auto Refresh Every 600 Seconds
-# -----------------------------
-from streamlit_autorefresh import st_autorefresh
-st_autorefresh(interval=600000, key="data_refresh")  # 600 sec = 10 min
-
 # -----------------------------
 # Footer
 # -----------------------------
 st.markdown("---")
 st.markdown("<div style='text-align:center; color: gray;'>Your Financial Story — Designed & Delivered by <b>FinTalk Pro</b>.</div>", unsafe_allow_html=True)
+
+diagnostics_panel("risk")
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# Risk metrics for every user (no Streamlit)
+# -----------------------------
+# Same rules as the Risk Analyzer page, computed for all users in one groupby
+# pass. The page looks its user up in the returned frame (indexed by user_id).
+
+UTILIZATION_LIMIT = 30
+REPAYMENT_LIMIT = 0.4
+VOLATILITY_LIMIT = 0.25
+LOW_BALANCE_LIMIT = 5
+EMI_LIMIT = 5
+DAILY_ANOMALY_LIMIT = 2
+
+# (metric column, threshold, recommendation) - a rule fires when metric > threshold
+RECOMMENDATION_RULES = [
+    ("avg_util", UTILIZATION_LIMIT, "🔄 Consider lowering your credit utilization below 30%."),
+    ("avg_ratio", REPAYMENT_LIMIT, "💡 Re-evaluate your loan structure or seek financial counseling."),
+    ("volatility_ratio", VOLATILITY_LIMIT, "📉 Set up an emergency fund due to income fluctuations."),
+    ("low_balance_count", LOW_BALANCE_LIMIT, "🏦 Maintain a minimum balance to avoid penalties."),
+    ("avg_emi_count", EMI_LIMIT, "📆 Too many EMIs – consolidate loans if possible."),
+]
+
+
+def suspicious_mask(df):
+    return df["is_large"] | df["is_foreign"] | df["is_unusual_time"]
+
+
+def daily_anomaly_counts(df):
+    """Suspicious transactions per (user_id, date_only)."""
+    flagged = df[suspicious_mask(df)]
+    return flagged.groupby(["user_id", flagged["transaction_time"].dt.normalize().rename("date_only")]).size()
+
+
+def compute_risk_metrics(df):
+    """Return one row per user_id with the eight risk metrics and recommendations."""
+    work = pd.DataFrame({
+        "user_id": df["user_id"],
+        "credit_utilization_percent": df["credit_utilization_percent"],
+        "repayment_ratio": df["monthly_loan_payment"] / df["monthly_income"],
+        "over_budget": df["groceries_spent"] > df["groceries_budget"],
+        "monthly_income": df["monthly_income"],
+        "suspicious": suspicious_mask(df),
+        # Balance below that user's average monthly expenses
+        "low_balance": df["account_balance"] < df.groupby("user_id")["monthly_expenses"].transform("mean"),
+        "security_alert_type": df["security_alert_type"],
+        "emi_count": df["emi_count"],
+    })
+
+    metrics = work.groupby("user_id").agg(
+        transaction_count=("over_budget", "size"),
+        avg_util=("credit_utilization_percent", "mean"),
+        avg_ratio=("repayment_ratio", "mean"),
+        over_budget_count=("over_budget", "sum"),
+        income_std=("monthly_income", "std"),
+        income_mean=("monthly_income", "mean"),
+        suspicious_count=("suspicious", "sum"),
+        low_balance_count=("low_balance", "sum"),
+        alert_types=("security_alert_type", "nunique"),
+        avg_emi_count=("emi_count", "mean"),
+    )
+    metrics["volatility_ratio"] = metrics["income_std"] / metrics["income_mean"]
+
+    daily = daily_anomaly_counts(df)
+    high_risk_days = (daily > DAILY_ANOMALY_LIMIT).groupby(level="user_id").sum()
+    metrics["high_risk_days"] = high_risk_days.reindex(metrics.index, fill_value=0).astype(int)
+
+    fired = np.column_stack([metrics[col].to_numpy() > limit for col, limit, _ in RECOMMENDATION_RULES])
+    texts = np.array([text for _, _, text in RECOMMENDATION_RULES], dtype=object)
+    metrics["recommendations"] = [list(texts[row]) for row in fired]
+    return metrics
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from model_registry import get_pipeline
+from profiling import section
+
+# --------------------------------------
+# 🗄️ Content-hash cache for AI summaries
+# --------------------------------------
+# Summaries are keyed on a hash of (task, model, generation kwargs, prompt)
+# and persisted in a local SQLite file, so a repeat click - or another client
+# whose numbers produce the same prompt - is answered without inference.
+
+CACHE_PATH = os.environ.get("FINTALK_SUMMARY_CACHE", "summary_cache.sqlite3")
+
+# Pipeline output field holding the text for each task
+OUTPUT_FIELDS = {"summarization": "summary_text", "text-generation": "generated_text"}
+
+_init_lock = threading.Lock()
+_initialized = set()
+
+
+def summary_key(task, model, prompt, params):
+    payload = json.dumps([task, model, params, prompt], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, timeout=30)
+    with _init_lock:
+        if path not in _initialized:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                "key TEXT PRIMARY KEY, task TEXT, model TEXT, output TEXT, created REAL)"
+            )
+            conn.commit()
+            _initialized.add(path)
+    return conn
+
+
+def get_cached(keys, path=CACHE_PATH):
+    """Return {key: output} for the keys already in the store."""
+    keys = list(keys)
+    found = {}
+    conn = _connect(path)
+    try:
+        # Stay under SQLite's bound-parameter limit for big pre-warm runs
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(f"SELECT key, output FROM summaries WHERE key IN ({placeholders})", chunk)
+            found.update(rows.fetchall())
+    finally:
+        conn.close()
+    return found
+
+
+def put_cached(entries, path=CACHE_PATH):
+    """entries: iterable of (key, task, model, output)."""
+    now = time.time()
+    conn = _connect(path)
+    try:
+        conn.executemany(
+            "INSERT OR REPLACE INTO summaries (key, task, model, output, created) VALUES (?, ?, ?, ?, ?)",
+            [(key, task, model, output, now) for key, task, model, output in entries],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def cached_generate(task, model, prompt, params, path=CACHE_PATH):
+    """Return the model text for prompt, running the pipeline only on a cache miss."""
+    key = summary_key(task, model, prompt, params)
+    hit = get_cached([key], path).get(key)
+    if hit is not None:
+        return hit
+
+    with section(f"model.{task}"):
+        output = get_pipeline(task, model)(prompt, **params)[0][OUTPUT_FIELDS[task]]
+    put_cached([(key, task, model, output)], path)
+    return output
+
+
+def generate_many(task, model, prompts, params, batch_size=8, path=CACHE_PATH):
+    """Return outputs for prompts (in order), running cache misses through the pipeline in batches."""
+    keys = [summary_key(task, model, prompt, params) for prompt in prompts]
+    found = get_cached(set(keys), path)
+
+    missing = {}
+    for key, prompt in zip(keys, prompts):
+        if key not in found:
+            missing.setdefault(key, prompt)
+
+    if missing:
+        pipe = get_pipeline(task, model)  # text-generation pipelines come with a pad token (see model_registry)
+        pending = list(missing.items())
+        for i in range(0, len(pending), batch_size):
+            chunk = pending[i:i + batch_size]
+            results = pipe([prompt for _, prompt in chunk], batch_size=batch_size, **params)
+            entries = []
+            for (key, _), result in zip(chunk, results):
+                # text-generation returns one list of candidates per input
+                if isinstance(result, list):
+                    result = result[0]
+                found[key] = result[OUTPUT_FIELDS[task]]
+                entries.append((key, task, model, found[key]))
+            put_cached(entries, path)
+
+    return [found[key] for key in keys], len(missing)
@@ -0,0 +1,322 @@
+"""Seeded synthetic copies of the five FinTalk datasets, at any size.
+
+    python synthetic_data.py --rows 1000000 --out /tmp/fintalk_1m
+    python synthetic_data.py trend risk --rows 10000000 --users 1000000 --out /tmp/fintalk_10m
+    FINTALK_DATA_DIR=/tmp/fintalk_1m streamlit run risk.py
+
+Files get the shipped names, columns, column order and value formats, plus the
+relationships the pages rely on (merchant and subscription type follow the
+trend category, is_large / is_unusual_time follow the risk amount and hour,
+available credit never exceeds the limit, ...). Rows are generated in fixed
+blocks of CHUNK_ROWS, each from its own seeded stream, so the same seed and
+sizes give byte-identical files and memory stays flat at any size. An
+fx_rates.csv covering the portfolio dates is written alongside.
+"""
+import argparse
+import os
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from data_access import DATASETS
+
+CHUNK_ROWS = 1_000_000
+
+# Rows per client when --users isn't given (about what the shipped files have)
+ROWS_PER_USER = {"risk": 200, "trend": 200, "portfolio": 20}
+FIRST_USER_ID = {"risk": 1017, "portfolio": 1}  # the risk page opens on user 1017
+
+PORTFOLIO_LAST_DAY = np.datetime64("2025-04-10")
+PORTFOLIO_DAYS = 365
+FX_RATES_FILE = "fx_rates.csv"
+
+
+# --------------------------------------
+# Value pools
+# --------------------------------------
+# trend category -> (merchant, subscription_type, income?)
+TREND_CATEGORIES = {
+    "Salary": ("Employer Pvt Ltd", "Salary", True),
+    "Freelance": ("Employer Pvt Ltd", "Freelance", True),
+    "Rent": ("Rent Inc.", "Rent", False),
+    "SIP": ("SIP Inc.", "Financial Services", False),
+    "Spotify": ("Spotify Inc.", "Entertainment", False),
+    "Groceries": ("Groceries Inc.", "Groceries", False),
+    "Dining": ("Dining Inc.", "Dining", False),
+    "Insurance": ("Insurance Inc.", "Financial Services", False),
+}
+TREND_OPENING_BALANCE = 100_000
+
+RISK_CATEGORIES = ["travel", "salary", "bills", "groceries", "entertainment", "shopping"]
+RISK_ALERTS = ["None", "Malware", "Account lockout", "Unauthorized login", "Phishing"]
+RISK_ALERT_WEIGHTS = [0.44, 0.14, 0.14, 0.14, 0.14]
+LARGE_AMOUNT = 50_000
+SURNAMES = ["Higgins", "Sanders", "Nguyen", "Lowery", "Lopez", "Rodriguez", "Cook", "Kelly", "Davis", "Zavala",
+            "Warren", "Smith", "Beard", "Lee", "Marshall", "Heath", "Porter", "Bullock", "Navarro", "Carr"]
+PLACES = ["Kara", "Chris", "Emily", "Watts", "Todd", "Caitlin", "Christian", "Patricia", "Alvarez", "Gilbert", "Evan"]
+
+ASSET_TYPES = ["bond", "mutual fund", "stock", "ETF"]
+ASSET_TYPE_WEIGHTS = [0.33, 0.28, 0.22, 0.17]
+ASSET_NAMES = ["Prologis Inc", "Google Inc", "NextEra Inc", "iShares Inc", "P&G Inc", "Johnson Inc", "Amazon Inc",
+               "Tesla Inc", "Microsoft Inc", "Apple Inc", "Exxon Inc", "JPMorgan Inc", "Vanguard Inc"]
+TICKERS = ["JNJ", "XOM", "GOOGL", "BND", "MSFT", "VOO", "NEE", "AMZN", "PG", "JPM", "PLD", "AAPL", "TSLA"]
+SECTORS = ["Healthcare", "Technology", "Utilities", "Finance", "Real Estate", "Energy", "Consumer Goods"]
+RISK_LEVELS = ["Medium", "High", "Low"]
+
+MISSED_PAYMENT_WEIGHTS = [0.22, 0.27, 0.30, 0.14, 0.03, 0.025, 0.015]
+INQUIRY_WEIGHTS = [0.31, 0.36, 0.255, 0.05, 0.015, 0.01]
+
+PERSONAL_CATEGORIES = ["Transport", "Healthcare", "Groceries", "Dining", "Rent", "Entertainment", "Utilities",
+                       "Education"]
+PERSONAL_ALERTS = ["Payment Due", "Budget Exceeded", "Unusual Activity", "Low Balance"]
+
+
+def _merchant_pool(rng, size=5000):
+    a, b, c = (rng.choice(SURNAMES, size) for _ in range(3))
+    style = rng.integers(0, 5, size)
+    names = np.where(style == 0, np.char.add(a, " Group"),
+             np.where(style == 1, np.char.add(np.char.add(a, "-"), b),
+             np.where(style == 2, np.char.add(np.char.add(np.char.add(np.char.add(a, ", "), b), " and "), c),
+             np.where(style == 3, np.char.add(a, " PLC"), np.char.add(a, " Ltd")))))
+    return names.astype(object)
+
+
+def _location_pool(rng, size=5000):
+    prefix = rng.choice(["", "", "North ", "South ", "East ", "West ", "New "], size)
+    suffix = rng.choice(["side", "land", "borough", "port", "furt", "shire", "fort", "mouth", "ton"], size)
+    return np.char.add(np.char.add(prefix, rng.choice(PLACES, size)), suffix).astype(object)
+
+
+def _clock(ms):
+    """'HH:MM:SS.fff' strings for milliseconds since midnight (fixed-width digits, built without a Python loop)."""
+    parts = [ms // 3_600_000, ms // 60_000 % 60, ms // 1000 % 60, ms % 1000]
+    out = np.full((len(ms), 12), ord(":"), dtype=np.uint8)
+    for col, (value, width) in zip([0, 3, 6, 9], zip(parts, [2, 2, 2, 3])):
+        for d in range(width):
+            out[:, col + d] = ord("0") + value // 10 ** (width - 1 - d) % 10
+    out[:, 8] = ord(".")
+    return out.view("S12").ravel().astype(str)
+
+
+def _money(values):
+    return np.round(values, 2)
+
+
+# --------------------------------------
+# Per-dataset block generators: (rng, row positions, users, total rows, state) -> DataFrame
+# --------------------------------------
+def _trend(rng, index, users, total, state):
+    n = len(index)
+    names = np.array(list(TREND_CATEGORIES))
+    merchant, subscription, income = (np.array([TREND_CATEGORIES[c][i] for c in names]) for i in range(3))
+    code = rng.integers(0, len(names), n)
+    category = names[code]
+    amount = np.where(income[code], rng.integers(30_000, 80_000, n), -rng.integers(500, 20_000, n))
+
+    user = rng.integers(0, users, n)
+    balance = state.setdefault("balance", np.full(users, TREND_OPENING_BALANCE, dtype=np.int64))
+    running = pd.Series(amount).groupby(user).cumsum().to_numpy() + balance[user]
+    balance += np.bincount(user, weights=amount, minlength=users).astype(np.int64)
+
+    day = np.datetime64("1980-04-01") + rng.integers(0, 15_867, n).astype("timedelta64[D]")
+    return pd.DataFrame({
+        "transaction_id": np.char.add("T", (1000 + index).astype(str)),
+        "transaction_date": pd.DatetimeIndex(day),
+        "transaction_time": _clock(rng.integers(0, 86_400_000, n)),
+        "transaction_category": category,
+        "merchant": merchant[code],
+        "amount": amount,
+        "user_id": np.char.add("user_", user.astype(str)),
+        "recurring_flag": rng.random(n) < 0.52,
+        "subscription_type": subscription[code],
+        "is_investment": category == "SIP",
+        "refined_category": category,
+        "balance": running,
+    })
+
+
+def _risk(rng, index, users, total, state):
+    n = len(index)
+    if "merchants" not in state:
+        pool_rng = _stream(state["seed"], "risk", 0)
+        state["merchants"], state["locations"] = _merchant_pool(pool_rng), _location_pool(pool_rng)
+        state["base_income"] = pool_rng.normal(49_500, 8_000, users).clip(15_000)
+
+    user = rng.integers(0, users, n)
+    income = state["base_income"][user] * rng.normal(1, 0.15, n).clip(0.4)
+    amount = rng.uniform(800, 100_000, n)
+    when = (np.datetime64("2025-01-12T00:00:00")
+            + rng.integers(0, 89 * 86_400, n).astype("timedelta64[s]"))
+    hour = (when.astype("datetime64[h]") - when.astype("datetime64[D]")).astype(int)
+    budget = rng.normal(8_260, 1_420, n).clip(4_000)
+    return pd.DataFrame({
+        "user_id": FIRST_USER_ID["risk"] + user,
+        "monthly_income": _money(income),
+        "monthly_expenses": _money(income * rng.uniform(0.45, 1.2, n)),
+        "credit_utilization_percent": _money(rng.uniform(10, 90, n)),
+        "monthly_loan_payment": _money(rng.normal(14_800, 5_000, n).clip(1_500)),
+        "groceries_budget": _money(budget),
+        "groceries_spent": _money(budget * rng.uniform(0.65, 1.5, n)),
+        "account_balance": _money(rng.normal(30_300, 15_000, n)),
+        "transaction_amount": _money(amount),
+        "transaction_time": pd.DatetimeIndex(when),
+        "merchant": rng.choice(state["merchants"], n),
+        "transaction_category": rng.choice(RISK_CATEGORIES, n),
+        "location": rng.choice(state["locations"], n),
+        "is_foreign": rng.random(n) < 0.58,
+        "is_large": amount > LARGE_AMOUNT,
+        "is_unusual_time": (hour < 6) | (hour == 23),
+        "security_alert_type": rng.choice(RISK_ALERTS, n, p=RISK_ALERT_WEIGHTS),
+        "emi_count": rng.integers(1, 10, n),
+    })
+
+
+def _portfolio(rng, index, users, total, state):
+    n = len(index)
+    invested = rng.uniform(1_000, 50_000, n)
+    # Rows are in date order (an append-only holdings table), spread over the PORTFOLIO_DAYS up to the last day
+    day = PORTFOLIO_LAST_DAY - (PORTFOLIO_DAYS - 1) + (index * PORTFOLIO_DAYS // total).astype("timedelta64[D]")
+    return pd.DataFrame({
+        "user_id": FIRST_USER_ID["portfolio"] + rng.integers(0, users, n),
+        "asset_type": rng.choice(ASSET_TYPES, n, p=ASSET_TYPE_WEIGHTS),
+        "asset_name": rng.choice(ASSET_NAMES, n),
+        "ticker": rng.choice(TICKERS, n),
+        "investment_amount": _money(invested),
+        "current_value": _money(invested * rng.uniform(0.8, 1.5, n)),
+        "sector": rng.choice(SECTORS, n),
+        "risk_level": rng.choice(RISK_LEVELS, n),
+        "timestamp": pd.DatetimeIndex(day),
+    })
+
+
+def _credit(rng, index, users, total, state):
+    n = len(index)
+    limit = rng.integers(1_000, 50_000, n)
+    unused = rng.random(n) < 0.53
+    return pd.DataFrame({
+        "Total Credit Limit": limit,
+        "Available Credit": np.where(unused, limit, (limit * rng.random(n)).round()).astype(float),
+        "Monthly Loan Payment": rng.integers(0, 5_000, n),
+        "Loan Balance": rng.integers(300, 100_000, n),
+        "Number of Missed Payments": rng.choice(7, n, p=MISSED_PAYMENT_WEIGHTS),
+        "Credit Age (in months)": rng.integers(6, 360, n),
+        "Number of Credit Types (loan, card)": rng.integers(1, 5, n),
+        "New Credit Inquiries (last 6 months)": rng.choice(6, n, p=INQUIRY_WEIGHTS),
+        "On-Time Payment Percentage": _money(rng.uniform(50, 100, n)),
+    })
+
+
+def _personal(rng, index, users, total, state):
+    n = len(index)
+    return pd.DataFrame({
+        "Account Balance": _money(rng.uniform(150, 9_900, n)),
+        "Available Credit": _money(rng.uniform(120, 5_000, n)),
+        "Recent Transaction Amount": _money(-rng.uniform(5, 500, n)),
+        "Transaction Category": rng.choice(PERSONAL_CATEGORIES, n),
+        "Monthly Income": _money(rng.uniform(1_000, 10_000, n)),
+        "Monthly Expenses": _money(rng.uniform(880, 9_500, n)),
+        "Groceries Budget": _money(rng.uniform(100, 1_000, n)),
+        "Groceries Spent": _money(rng.uniform(50, 1_200, n)),
+        "Loan Balance": _money(rng.uniform(150, 20_000, n)),
+        "Monthly Loan Payment": _money(rng.uniform(5, 1_000, n)),
+        "Credit Utilization (%)": _money(rng.uniform(0, 100, n)),
+        "Security Alert Type": rng.choice(PERSONAL_ALERTS, n),
+    })
+
+
+GENERATORS = {"personal": _personal, "risk": _risk, "trend": _trend, "portfolio": _portfolio, "credit": _credit}
+
+
+def default_users(name, rows):
+    return max(1, rows // ROWS_PER_USER[name]) if name in ROWS_PER_USER else None
+
+
+def _stream(seed, name, block):
+    return np.random.default_rng([seed, zlib.crc32(name.encode()), block])
+
+
+def iter_chunks(name, rows, users=None, seed=0):
+    """The dataset as DataFrames of up to CHUNK_ROWS rows, in file order."""
+    users = users or default_users(name, rows)
+    state = {"seed": seed}
+    for i, start in enumerate(range(0, rows, CHUNK_ROWS)):
+        rng = _stream(seed, name, i + 1)
+        index = np.arange(start, min(start + CHUNK_ROWS, rows), dtype=np.int64)
+        yield GENERATORS[name](rng, index, users, rows, state)
+
+
+def generate(name, rows, users=None, seed=0):
+    """The whole dataset in memory, as written to the CSV (unparsed dates included)."""
+    chunks = list(iter_chunks(name, rows, users, seed))
+    return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+
+
+def _csv_block(chunk, header):
+    return chunk.to_csv(header=header, index=False).encode("utf-8")
+
+
+def write_dataset(name, rows, out_dir, users=None, seed=0, workers=None):
+    """Write the dataset's CSV (under its shipped file name) to out_dir; returns the path.
+
+    Blocks are generated in order here and formatted to CSV (the slow part) by
+    a pool of workers, at most two blocks per worker in flight.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, DATASETS[name][0])
+    workers = workers or os.cpu_count() or 1
+    chunks = iter_chunks(name, rows, users, seed)
+    with open(path, "wb") as f:
+        if workers == 1 or rows <= CHUNK_ROWS:
+            for i, chunk in enumerate(chunks):
+                f.write(_csv_block(chunk, i == 0))
+            return path
+        with ProcessPoolExecutor(workers) as pool:
+            pending = deque()
+            for i, chunk in enumerate(chunks):
+                pending.append(pool.submit(_csv_block, chunk, i == 0))
+                if len(pending) >= 2 * workers:
+                    f.write(pending.popleft().result())
+            while pending:
+                f.write(pending.popleft().result())
+    return path
+
+
+def write_fx_rates(out_dir, seed=0):
+    """Daily USD rates (a small random walk around 83) over the portfolio window."""
+    rng = _stream(seed, "fx", 0)
+    days = np.arange(PORTFOLIO_LAST_DAY - PORTFOLIO_DAYS + 1, PORTFOLIO_LAST_DAY + 1)
+    rates = 83.0 * np.exp(np.cumsum(rng.normal(0, 0.002, len(days))))
+    path = os.path.join(out_dir, FX_RATES_FILE)
+    pd.DataFrame({"date": days, "currency": "USD", "inr_per_unit": rates.round(4)}).to_csv(path, index=False)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write seeded synthetic FinTalk datasets")
+    parser.add_argument("datasets", nargs="*", help=f"any of {', '.join(GENERATORS)} (default: all)")
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--users", type=int, default=None,
+                        help="clients for risk / trend / portfolio (default: rows per client as shipped)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--workers", type=int, default=None, help="processes formatting CSV blocks (default: all cores)")
+    args = parser.parse_args(argv)
+    unknown = set(args.datasets) - set(GENERATORS)
+    if unknown:
+        parser.error(f"unknown dataset(s): {', '.join(sorted(unknown))}")
+
+    for name in args.datasets or list(GENERATORS):
+        start = time.perf_counter()
+        path = write_dataset(name, args.rows, args.out, args.users, args.seed, args.workers)
+        users = args.users or default_users(name, args.rows)
+        print(f"{name}: {args.rows} rows{f', {users} users' if users else ''} -> {path} "
+              f"({os.path.getsize(path) / 1e6:.1f} MB, {time.perf_counter() - start:.1f}s)")
+    print(f"fx: {write_fx_rates(args.out, args.seed)}")
+
+
+if __name__ == "__main__":
+    main()
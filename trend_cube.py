@@ -0,0 +1,151 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+# -------------------------------------------------
+# Pre-aggregated (date, minute, category, type) cube for the trend page
+# -------------------------------------------------
+# Built from the transaction rows once per load (and merged incrementally as
+# the feed appends rows). Date / category / aggregation widgets are answered by
+# slicing this cube, whose size is bounded by distinct buckets rather than by
+# transaction volume. Cells live in growable arrays with a key -> row dict, so
+# an append aggregates only the new rows and adds them into their cells.
+# Readers get .frame, an immutable copy built under the same lock as add(), and
+# slice it with view() / date_bounds() (module functions, so a caller holding
+# one frame gets answers from one consistent state).
+
+KEYS = ["day", "minute", "transaction_category", "type"]
+COLUMNS = KEYS + ["amount", "count"]
+MINUTE_LABELS = np.array([f"{m // 60:02d}:{m % 60:02d}" for m in range(1440)])
+
+
+def _aggregate(rows):
+    when = rows["transaction_datetime"]
+    keyed = pd.DataFrame({
+        "day": when.dt.normalize(),
+        "minute": (when.dt.hour * 60 + when.dt.minute).astype("int16"),
+        "transaction_category": rows["transaction_category"],
+        "type": rows["type"],
+        "amount": rows["amount"],
+    })
+    return keyed.groupby(KEYS, sort=False).agg(amount=("amount", "sum"), count=("amount", "size")).reset_index()
+
+
+class TrendCube:
+    def __init__(self, rows=None):
+        self._cells = {}      # (day, minute, category, type) -> row in the arrays
+        self._arrays = None   # column -> array, grown by doubling
+        self._dtypes = None   # column -> dtype of the last aggregated rows (e.g. pandas string columns)
+        self._size = 0
+        self._frame = None
+        self._lock = threading.Lock()
+        if rows is not None and len(rows):
+            self.add(rows)
+
+    def _reserve(self, size, new):
+        """Room for size cells, in dtypes that hold both the cells so far and new (e.g. int amounts then floats)."""
+        values = {name: new[name].to_numpy() for name in COLUMNS}
+        if self._arrays is None:
+            self._arrays = {name: np.zeros(0, v.dtype) for name, v in values.items()}
+        capacity = len(self._arrays["amount"])
+        dtypes = {name: np.result_type(self._arrays[name].dtype, v.dtype) for name, v in values.items()}
+        if size <= capacity and all(self._arrays[n].dtype == d for n, d in dtypes.items()):
+            return
+        capacity = max(size, 2 * capacity, 1024) if size > capacity else capacity
+        for name, old in self._arrays.items():
+            grown = np.zeros(capacity, dtypes[name])
+            grown[:self._size] = old[:self._size]
+            self._arrays[name] = grown
+
+    def add(self, rows):
+        """Fold newly appended transaction rows into the cube (cost grows with the new rows only)."""
+        new = _aggregate(rows)
+        if not len(new):
+            return
+        with self._lock:
+            self._merge(new)
+
+    def _merge(self, new):
+        keys = list(zip(new["day"].tolist(), new["minute"].tolist(),
+                        new["transaction_category"].tolist(), new["type"].tolist()))
+        positions = np.fromiter((self._cells.get(k, -1) for k in keys), dtype=np.int64, count=len(keys))
+
+        fresh = positions < 0
+        self._reserve(self._size + int(fresh.sum()), new)
+        self._dtypes = new.dtypes.to_dict()
+        if fresh.any():
+            added = np.arange(self._size, self._size + int(fresh.sum()))
+            self._cells.update(zip((k for k, f in zip(keys, fresh) if f), added.tolist()))
+            for name in KEYS:
+                self._arrays[name][added] = new[name].to_numpy()[fresh]
+            positions[fresh] = added
+            self._size = added[-1] + 1
+
+        # groupby keys are unique, so each cell is hit at most once
+        self._arrays["amount"][positions] += new["amount"].to_numpy()
+        self._arrays["count"][positions] += new["count"].to_numpy()
+        self._frame = None
+
+    @property
+    def frame(self):
+        """The cells as a DataFrame [day, minute, transaction_category, type, amount, count], built after each add."""
+        with self._lock:
+            if self._frame is None:
+                if self._arrays is None:
+                    self._frame = pd.DataFrame(columns=COLUMNS)
+                else:
+                    columns = {name: values[:self._size].copy() for name, values in self._arrays.items()}
+                    self._frame = pd.DataFrame(columns).astype(self._dtypes)
+            return self._frame
+
+    def date_bounds(self):
+        return date_bounds(self.frame)
+
+    def view(self, start_date=None, end_date=None, categories=None):
+        return view(self.frame, start_date, end_date, categories)
+
+
+def date_bounds(cells):
+    """(first, last) day present in the cells."""
+    return cells["day"].min().date(), cells["day"].max().date()
+
+
+def view(cells, start_date=None, end_date=None, categories=None):
+    """Cube cells inside the date range (inclusive) and category selection."""
+    mask = np.ones(len(cells), dtype=bool)
+    if start_date is not None:
+        mask &= (cells["day"] >= pd.Timestamp(start_date)).to_numpy()
+    if end_date is not None:
+        mask &= (cells["day"] <= pd.Timestamp(end_date)).to_numpy()
+    if categories is not None:
+        mask &= cells["transaction_category"].isin(categories).to_numpy()
+    return cells[mask]
+
+
+def balance_curve(cells):
+    """Running balance over the cells, one point per minute bucket in time order: [transaction_datetime, cumulative_balance]."""
+    when = (cells["day"] + pd.to_timedelta(cells["minute"].to_numpy(dtype="int64"), unit="m")).to_numpy()
+    per_minute = cells["amount"].groupby(when).sum()
+    return pd.DataFrame({"transaction_datetime": per_minute.index, "cumulative_balance": per_minute.cumsum().to_numpy()})
+
+
+def bucket_totals(cells, level="Hour"):
+    """Income/Expense sums per hour or 'HH:MM' bucket (groupby(['time_bucket','type']).sum().unstack())."""
+    minute = cells["minute"].to_numpy()
+    bucket = minute // 60 if level == "Hour" else MINUTE_LABELS[minute]
+    grouped = cells.groupby([pd.Series(bucket, index=cells.index, name="time_bucket"), "type"])["amount"].sum()
+    return grouped.unstack().fillna(0)
+
+
+def minute_totals(cells, txn_type):
+    """Sum per 'HH:MM' for one transaction type."""
+    cells = cells[cells["type"] == txn_type]
+    labels = pd.Series(MINUTE_LABELS[cells["minute"].to_numpy()], index=cells.index, name="transaction_datetime")
+    return cells.groupby(labels)["amount"].sum()
+
+
+def totals(cells):
+    """(transaction count, income total, expense total) for the selected cells."""
+    by_type = cells.groupby("type")["amount"].sum()
+    return int(cells["count"].sum()), by_type.get("Income", 0), by_type.get("Expense", 0)
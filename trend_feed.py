@@ -0,0 +1,156 @@
+import os
+import threading
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from data_access import csv_path, prepare_trend
+from anomaly_stream import StreamingAnomalyDetector, log_magnitude
+from report_format import transaction_type
+from trend_cube import TrendCube, bucket_totals, date_bounds, view
+
+# -------------------------------------------------
+# Incremental loader for the append-only transaction feed
+# -------------------------------------------------
+# Remembers the byte offset of the last fully ingested line, so a refresh only
+# parses rows appended since then and folds them into the running aggregates.
+# New rows are kept as chunks and concatenated once, when .frame is next read.
+# A file that was replaced (new inode), shrank, or no longer starts with the
+# bytes already read or ends them the same way (rewritten in place) is
+# reloaded from scratch.
+#
+# The feed is shared by every session (and the API's threads), so readers take
+# a FeedSnapshot: the cube cells, the outlier candidates and the categories as
+# of one ingest, built under the same lock refresh() holds. The candidates are
+# the few rows any outlier view can show - over CANDIDATE_MIN_AMOUNT or flagged
+# by the rolling detector - so filtering them doesn't grow with the feed.
+
+FEED_COLUMNS = ["transaction_id", "transaction_datetime", "transaction_category", "merchant", "amount", "balance",
+                "user_id"]
+CHECK_BYTES = 4096   # file head and tail of the ingested part compared on each refresh
+CANDIDATE_MIN_AMOUNT = 10_000   # lowest outlier threshold the page offers
+
+
+class FeedSnapshot:
+    """One consistent state of the feed: cube cells, outlier candidate rows and categories."""
+    __slots__ = ("cells", "candidates", "categories")
+
+    def __init__(self, cells, candidates, categories):
+        self.cells, self.candidates, self.categories = cells, candidates, categories
+
+    def date_bounds(self):
+        return date_bounds(self.cells)
+
+    def view(self, start_date=None, end_date=None, categories=None):
+        return view(self.cells, start_date, end_date, categories)
+
+
+class TrendFeed:
+    def __init__(self, path=None):
+        self.path = path or csv_path("trend")
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.offset = 0
+        self.header = None
+        self._inode = self._mtime_ns = None
+        self._head = self._tail = b""
+        self._frame = pd.DataFrame(columns=FEED_COLUMNS + ["transaction_day", "type", "anomaly_score",
+                                                           "is_stat_anomaly"])
+        self._chunks = []
+        self._candidates = self._frame
+        self._candidate_chunks = []
+        self._snapshot = None
+        self.cube = TrendCube()
+        self.detector = StreamingAnomalyDetector()  # per user and per category, in arrival order
+        self.categories = []  # in order of first appearance
+
+    @property
+    def frame(self):
+        """Every ingested row (appended chunks are concatenated on first access)."""
+        with self._lock:
+            if self._chunks:
+                parts = [self._frame] if len(self._frame) else []
+                self._frame = pd.concat(parts + self._chunks, ignore_index=True)
+                self._chunks = []
+            return self._frame
+
+    def snapshot(self):
+        """The FeedSnapshot of the last ingest (the same object until new rows arrive)."""
+        with self._lock:
+            if self._snapshot is None:
+                if self._candidate_chunks:
+                    parts = [self._candidates] if len(self._candidates) else []
+                    self._candidates = pd.concat(parts + self._candidate_chunks, ignore_index=True)
+                    self._candidate_chunks = []
+                self._snapshot = FeedSnapshot(self.cube.frame, self._candidates, tuple(self.categories))
+            return self._snapshot
+
+    def _same_file(self, f, info):
+        """True when the file still holds exactly the bytes already ingested (only appended to since)."""
+        if info.st_ino != self._inode or info.st_size < self.offset:
+            return False
+        if f.read(len(self._head)) != self._head:
+            return False
+        f.seek(self.offset - len(self._tail))
+        return f.read(len(self._tail)) == self._tail
+
+    def refresh(self):
+        """Ingest rows appended since the last call; returns the number of new rows."""
+        with self._lock:
+            info = os.stat(self.path)
+            if (info.st_ino, info.st_mtime_ns, info.st_size) == (self._inode, self._mtime_ns, self.offset):
+                return 0
+
+            with open(self.path, "rb") as f:
+                if self.offset and not self._same_file(f, info):
+                    self._reset()
+                self._inode, self._mtime_ns = info.st_ino, info.st_mtime_ns
+                if info.st_size == self.offset:
+                    return 0
+                f.seek(self.offset)
+                chunk = f.read(info.st_size - self.offset)
+
+            # Leave a partially written last line for the next refresh
+            end = chunk.rfind(b"\n") + 1
+            if end == 0:
+                return 0
+            chunk = chunk[:end]
+            consumed = len(chunk)
+            if len(self._head) < CHECK_BYTES:
+                self._head = (self._head + chunk)[:CHECK_BYTES]
+            self._tail = (self._tail + chunk)[-CHECK_BYTES:]
+
+            if self.header is None:
+                first = chunk.index(b"\n") + 1
+                self.header = chunk[:first].decode("utf-8").strip().split(",")
+                chunk = chunk[first:]
+
+            self.offset += consumed
+            if not chunk.strip():
+                return 0
+
+            new = pd.read_csv(BytesIO(chunk), header=None, names=self.header)
+            self._ingest(prepare_trend(new)[FEED_COLUMNS].copy())
+            return len(new)
+
+    def _ingest(self, new):
+        amount = new["amount"].to_numpy(dtype=float)
+        new["transaction_day"] = new["transaction_datetime"].dt.normalize()
+        new["type"] = transaction_type(amount)
+        new["anomaly_score"], new["is_stat_anomaly"] = self.detector.score_arrays(
+            [new["user_id"].tolist(), new["transaction_category"].tolist()], log_magnitude(amount)
+        )
+
+        self.cube.add(new)
+        seen = set(self.categories)
+        self.categories += [c for c in new["transaction_category"].unique() if c not in seen]
+        self._chunks.append(new)
+        self._candidate_chunks.append(new[(np.abs(amount) > CANDIDATE_MIN_AMOUNT) | new["is_stat_anomaly"].to_numpy()])
+        self._snapshot = None
+
+    def bucket_totals(self, level="Hour"):
+        """Income/Expense sums per time bucket over the whole feed."""
+        return bucket_totals(self.cube.frame, level)